@@ -0,0 +1,232 @@
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+
+from game import Game
+from record_format import RecordWriter, VARIANT_BACKEND
+
+# 🏭 Nightly balance runs: N seeded backend games sharded across processes.
+# Every game is rebuilt from its seed alone, so any result line can be replayed.
+#
+# With the backend rules (center piles only, the waste is never recycled) a
+# game almost never gets won: both players run out of plays and the game
+# stalls. So every game is also scored by the card race, the cards each
+# player still has to get rid of (crapette, talon, tableau) when it ends,
+# and the balance numbers come from who finished ahead.
+
+
+def greedy_policy(game, plays):
+    if plays:
+        return plays[0]
+    return 'draw' if game.players[game.turn].talon else 'skip'
+
+
+def random_policy(game, plays):
+    options = plays + ['draw'] if game.players[game.turn].talon else plays
+    return game.rng.choice(options) if options else 'skip'
+
+
+POLICIES = {'greedy': greedy_policy, 'random': random_policy}
+
+
+def play_one(seed, policy, max_turns, writer=None):
+    game = Game(seed)
+    first = game.turn
+    if writer:
+        writer.begin_game(seed, VARIANT_BACKEND, 0, min(max_turns, 0xFFFF))
+    winner, turns = game.run(policy, max_turns, record=writer and writer.write)
+    if writer:
+        writer.end_game(winner, turns)
+    left = tuple(len(p.crapette) + len(p.talon) + len(p.tableau) for p in game.players)
+    return seed, first, winner, turns, left
+
+
+def leader(winner, left):
+    """Who finished ahead: the winner, else whoever has fewer cards left (None on a tie)."""
+    if winner is not None:
+        return winner
+    if left[0] == left[1]:
+        return None
+    return 0 if left[0] < left[1] else 1
+
+
+class Stats:
+    """Mergeable aggregates, so workers can send back a few numbers instead of every game."""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = [0, 0]
+        self.first_player_wins = 0
+        self.first_player = [0, 0]
+        self.stalemates = 0
+        self.lengths = Counter()
+        self.ahead = [0, 0]
+        self.first_player_ahead = 0
+        self.first_player_lead = 0    # summed over games: opponent's cards left - first player's
+
+    def add(self, seed, first, winner, turns, left):
+        self.games += 1
+        self.first_player[first] += 1
+        self.lengths[turns] += 1
+        ahead = leader(winner, left)
+        if ahead is not None:
+            self.ahead[ahead] += 1
+            if ahead == first:
+                self.first_player_ahead += 1
+        self.first_player_lead += left[1 - first] - left[first]
+        if winner is None:
+            self.stalemates += 1
+        else:
+            self.wins[winner] += 1
+            if winner == first:
+                self.first_player_wins += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.first_player_wins += other.first_player_wins
+        self.first_player = [a + b for a, b in zip(self.first_player, other.first_player)]
+        self.stalemates += other.stalemates
+        self.lengths.update(other.lengths)
+        self.ahead = [a + b for a, b in zip(self.ahead, other.ahead)]
+        self.first_player_ahead += other.first_player_ahead
+        self.first_player_lead += other.first_player_lead
+
+    def length_percentile(self, q):
+        target = q * self.games
+        seen = 0
+        for turns in sorted(self.lengths):
+            seen += self.lengths[turns]
+            if seen >= target:
+                return turns
+        return 0
+
+    def summary(self):
+        decided = self.games - self.stalemates
+        led = sum(self.ahead)
+        summary = {
+            'games': self.games,
+            'win_rate': [w / self.games if self.games else 0.0 for w in self.wins],
+            'first_player_share': [f / self.games if self.games else 0.0 for f in self.first_player],
+            'first_player_win_rate': self.first_player_wins / decided if decided else 0.0,
+            'stalemate_rate': self.stalemates / self.games if self.games else 0.0,
+            'ahead_rate': [a / self.games if self.games else 0.0 for a in self.ahead],
+            'first_player_ahead_rate': self.first_player_ahead / led if led else 0.0,
+            'first_player_mean_lead': self.first_player_lead / self.games if self.games else 0.0,
+            'mean_turns': sum(t * n for t, n in self.lengths.items()) / self.games if self.games else 0.0,
+            'median_turns': self.length_percentile(0.5),
+            'p95_turns': self.length_percentile(0.95),
+            'max_turns': max(self.lengths) if self.lengths else 0,
+        }
+        if self.games and not decided:
+            summary['note'] = ("no game was won (the backend rules stall once both talons are spent): "
+                               "compare ahead_rate / first_player_ahead_rate instead of the win rates")
+        return summary
+
+
+def run_shard(start, count, base_seed, policy_name, max_turns, keep_rows, record=False):
+    policy = POLICIES[policy_name]
+    stats = Stats()
+    rows = [] if keep_rows else None
+    # Recorded games come back as bytes (a few hundred per game) for the parent to append
+    buffer = io.BytesIO() if record else None
+    writer = RecordWriter(buffer, header=False) if record else None
+    for i in range(start, start + count):
+        row = play_one(base_seed + i, policy, max_turns, writer)
+        stats.add(*row)
+        if keep_rows:
+            rows.append(row)
+    return stats, rows, buffer.getvalue() if record else None
+
+
+def run_batch(games, workers=None, base_seed=0, policy='greedy', chunk=2000, max_turns=2000, on_rows=None, on_progress=None,
+              on_records=None):
+    """
+    Shards games into chunks over a process pool, keeping only a small window
+    of chunks in flight so memory stays flat for 10M+ game runs. on_records
+    gets each finished shard's game records as raw bytes.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = Stats()
+    shards = ((start, min(chunk, games - start)) for start in range(0, games, chunk))
+    in_flight = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        def submit_next():
+            for start, count in shards:
+                in_flight.add(pool.submit(run_shard, start, count, base_seed, policy, max_turns, on_rows is not None,
+                                            on_records is not None))
+                return True
+            return False
+
+        for _ in range(workers * 4):
+            if not submit_next():
+                break
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.remove(future)
+                stats, rows, records = future.result()
+                total.merge(stats)
+                if on_rows:
+                    on_rows(rows)
+                if on_records:
+                    on_records(records)
+                if on_progress:
+                    on_progress(total)
+                submit_next()
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play many seeded Crapette games and aggregate balance statistics.")
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument('--seed', type=int, default=0, help="game i uses seed + i")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--chunk', type=int, default=2000, help="games per task sent to a worker")
+    parser.add_argument('--max-turns', type=int, default=2000)
+    parser.add_argument('--results', help="stream one JSON line per game to this file")
+    parser.add_argument('--record', help="append every game's moves to this binary game record")
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    out = open(args.results, 'w') if args.results else None
+    record = RecordWriter(args.record) if args.record else None
+
+    def write_rows(rows):
+        for seed, first, winner, turns, left in rows:
+            out.write(json.dumps({'seed': seed, 'first': first, 'winner': winner, 'turns': turns,
+                                  'cards_left': left}) + "\n")
+
+    def progress(stats):
+        if not args.quiet:
+            print(f"⏳ {stats.games}/{args.games} games", file=sys.stderr)
+
+    start = time.perf_counter()
+    try:
+        stats = run_batch(args.games, args.workers, args.seed, args.policy, args.chunk, args.max_turns,
+                          on_rows=write_rows if out else None, on_progress=progress,
+                          on_records=record and record.file.write)
+    finally:
+        if out:
+            out.close()
+        if record:
+            record.close()
+    elapsed = time.perf_counter() - start
+
+    summary = stats.summary()
+    summary.update({'seed': args.seed, 'policy': args.policy, 'seconds': elapsed,
+                    'games_per_sec': stats.games / elapsed if elapsed else 0.0})
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+
+import card_rules
+
+from card import Card, Deck
+from player import Player
+
+# 🎲 Deals in bulk: an (N, 2, 52) uint8 array, one shuffled deck per player,
+# each card as its card_rules face (suit * 13 + rank). A row is in Deck.cards
+# order, so Player pops the crapette from the end, then the tableau:
+CRAPETTE_CARDS = slice(39, 52)   # crapette top is index 39 (popped last of the 13)
+CRAPETTE_TOP = 39
+TABLEAU_CARDS = slice(35, 39)
+TALON_CARDS = slice(0, 35)       # talon top is index 34
+
+CHUNK = 1 << 16  # deals per generator call; deal i always comes from chunk i // CHUNK
+
+# The card_rules tables as (face, target face) arrays for fancy indexing
+TABLEAU_TABLE = np.frombuffer(card_rules.TABLEAU, dtype=np.uint8).reshape(card_rules.EMPTY, card_rules.STRIDE)
+CRAPETTE_TABLE = np.frombuffer(card_rules.CRAPETTE, dtype=np.uint8).reshape(card_rules.EMPTY, card_rules.STRIDE)
+
+
+def deal_chunk(seed, chunk_no, size=CHUNK):
+    """One chunk of deals; Generator.permuted shuffles every deck in C, no per-deal loop."""
+    rng = np.random.default_rng([seed, chunk_no])
+    decks = np.broadcast_to(np.arange(52, dtype=np.uint8), (size, 2, 52)).copy()
+    return rng.permuted(decks, axis=2, out=decks)
+
+
+def bulk_deals(n, seed=0):
+    """n seeded deals as (n, 2, 52) uint8. Same seed, same deals, whatever n is."""
+    deals = np.empty((n, 2, 52), dtype=np.uint8)
+    for start in range(0, n, CHUNK):
+        chunk = deal_chunk(seed, start // CHUNK)
+        deals[start:start + CHUNK] = chunk[:n - start]
+    return deals
+
+
+def deal_at(seed, i):
+    """Deal i of a seed on its own (regenerates its chunk)."""
+    return deal_chunk(seed, i // CHUNK)[i % CHUNK]
+
+
+def players_from(deal):
+    """Backend Players for one (2, 52) deal, to play it out or check it against Game."""
+    players = []
+    for p in (0, 1):
+        deck = Deck.__new__(Deck)
+        deck.cards = [Card(rank.upper(), suit) for rank, suit in (card_rules.FACES[face] for face in deal[p].tolist())]
+        players.append(Player(f"Player {p + 1}", deck))
+    return players
+
+
+def deal_features(deals):
+    """
+    Per-deal features for a whole array at once:
+      first_player       Game.decide_first_player: 0 if player 1's crapette top ranks higher, else 1
+      tableau_aces       (N, 2) aces among each player's four tableau cards
+      crapette_ace       (N, 2) crapette top is an ace (playable on an empty centre pile)
+      crapette_playable  (N, 2) crapette top has a move at the deal: an ace, onto one of the 8
+                         tableau cards, or onto the opponent's crapette top
+    """
+    ranks = deals % 13
+    top = deals[:, :, CRAPETTE_TOP]
+    top_ranks = ranks[:, :, CRAPETTE_TOP]
+    first_player = np.where(top_ranks[:, 0] > top_ranks[:, 1], 0, 1).astype(np.uint8)
+
+    tableau = deals[:, :, TABLEAU_CARDS].reshape(len(deals), 8)
+    tableau_aces = (ranks[:, :, TABLEAU_CARDS] == 0).sum(axis=2, dtype=np.uint8)
+    crapette_ace = top_ranks == 0
+    on_tableau = TABLEAU_TABLE[top[:, :, None], tableau[:, None, :]].any(axis=2)
+    on_opponent = CRAPETTE_TABLE[top, top[:, ::-1]].astype(bool)
+    return {
+        'first_player': first_player,
+        'tableau_aces': tableau_aces,
+        'crapette_ace': crapette_ace,
+        'crapette_playable': crapette_ace | on_tableau | on_opponent,
+    }
+
+
+class DealStats:
+    """Population statistics, accumulated chunk by chunk so memory stays flat."""
+
+    def __init__(self):
+        self.deals = 0
+        self.first_player = np.zeros(2, dtype=np.int64)
+        self.tableau_aces = np.zeros(9, dtype=np.int64)   # aces on all 8 tableau cards -> deals
+        self.crapette_ace = np.zeros(2, dtype=np.int64)
+        self.crapette_playable = np.zeros(2, dtype=np.int64)
+        self.both_playable = 0
+
+    def add(self, features):
+        self.deals += len(features['first_player'])
+        self.first_player += np.bincount(features['first_player'], minlength=2)
+        self.tableau_aces += np.bincount(features['tableau_aces'].sum(axis=1), minlength=9)
+        self.crapette_ace += features['crapette_ace'].sum(axis=0)
+        self.crapette_playable += features['crapette_playable'].sum(axis=0)
+        self.both_playable += int(features['crapette_playable'].all(axis=1).sum())
+
+    def summary(self):
+        n = self.deals or 1
+        return {
+            'deals': self.deals,
+            'first_player_share': (self.first_player / n).tolist(),
+            'mean_tableau_aces': float((self.tableau_aces * np.arange(9)).sum() / n),
+            'tableau_aces_distribution': (self.tableau_aces / n).tolist(),
+            'crapette_ace_rate': (self.crapette_ace / n).tolist(),
+            'crapette_playable_rate': (self.crapette_playable / n).tolist(),
+            'both_crapettes_playable_rate': self.both_playable / n,
+        }
+
+
+def deal_stats(n, seed=0):
+    stats = DealStats()
+    for start in range(0, n, CHUNK):
+        stats.add(deal_features(deal_chunk(seed, start // CHUNK)[:n - start]))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate seeded Crapette deals in bulk and report deal statistics.")
+    parser.add_argument('--deals', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help="also write the deals as an (N, 2, 52) uint8 .npy file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.save:
+        deals = np.lib.format.open_memmap(args.save, mode='w+', dtype=np.uint8, shape=(args.deals, 2, 52))
+        stats = DealStats()
+        for offset in range(0, args.deals, CHUNK):
+            chunk = deal_chunk(args.seed, offset // CHUNK)[:args.deals - offset]
+            deals[offset:offset + len(chunk)] = chunk
+            stats.add(deal_features(chunk))
+        deals.flush()
+    else:
+        stats = deal_stats(args.deals, args.seed)
+    elapsed = time.perf_counter() - start
+
+    summary = stats.summary()
+    summary.update({'seed': args.seed, 'seconds': elapsed, 'deals_per_sec': args.deals / elapsed if elapsed else 0.0})
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
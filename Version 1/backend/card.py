@@ -1,9 +1,28 @@
 import random
 
+from card_rules import FACE
+
 class Card:
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
+    """
+    Interned flyweight: Card('7', '♠') always returns the same object, so
+    cards compare and hash by identity and can key sets and dicts.
+    """
+    __slots__ = ('rank', 'suit', 'face')
+    _interned = {}
+
+    def __new__(cls, rank, suit):
+        card = cls._interned.get((rank, suit))
+        if card is None:
+            card = object.__new__(cls)
+            card.rank = rank
+            card.suit = suit
+            card.face = FACE[rank + suit]  # row/column in the card_rules tables
+            cls._interned[(rank, suit)] = card
+        return card
+
+    def __reduce__(self):
+        # Unpickled cards (e.g. from batch_runner workers) come back as the interned ones
+        return Card, (self.rank, self.suit)
 
     def color(self):
         return 'red' if self.suit in ['♥', '♦'] else 'black'
@@ -11,15 +30,16 @@ class Card:
     def __str__(self):
         return f"{self.rank}{self.suit}"
 
-    def __eq__(self, other):
-        return isinstance(other, Card) and self.rank == other.rank and self.suit == other.suit
+    def __repr__(self):
+        return f"Card({self.rank!r}, {self.suit!r})"
 
 class Deck:
-    def __init__(self):
+    def __init__(self, rng=None):
         ranks = ['A'] + [str(n) for n in range(2, 11)] + ['J', 'Q', 'K']
         suits = ['♠', '♥', '♦', '♣']
         self.cards = [Card(rank, suit) for rank in ranks for suit in suits]
-        random.shuffle(self.cards)
+        # Pass a random.Random to make the deal reproducible from a seed
+        (rng or random).shuffle(self.cards)
 
     def draw(self, n):
         return [self.cards.pop() for _ in range(n)]
@@ -1,12 +1,29 @@
-from card import Deck
+import random
+
+from card_rules import RANKS, FACES
+from card import Card, Deck
 from player import Player
 from piles import CenterPiles
 from utils import get_card_from_input
 
+# 📼 Move words for game records (see shared/record_format.py, VARIANT_BACKEND):
+# rank | suit << 4 | center pile << 6 for a card play (card_rules order), or draw/skip
+MOVE_DRAW = 0x3FE
+MOVE_SKIP = 0x3FF
+
+
+def encode_play(card, pile_index):
+    suit, rank = divmod(card.face, len(RANKS))
+    return rank | suit << 4 | pile_index << 6
+
+
 class Game:
-    def __init__(self):
-        self.deck1 = Deck()
-        self.deck2 = Deck()
+    def __init__(self, seed=None):
+        # Each game owns its RNG so a seed alone reproduces the deal
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.deck1 = Deck(self.rng)
+        self.deck2 = Deck(self.rng)
         self.players = [
             Player("Player 1", self.deck1),
             Player("Player 2", self.deck2)
@@ -15,11 +32,7 @@ class Game:
         self.turn = self.decide_first_player()
 
     def decide_first_player(self):
-        order = ['A'] + [str(n) for n in range(2, 11)] + ['J', 'Q', 'K']
-        p1 = self.players[0]
-        p2 = self.players[1]
-        v1 = order.index(p1.crapette[-1].rank)
-        v2 = order.index(p2.crapette[-1].rank)
+        v1, v2 = (player.crapette[-1].face % len(RANKS) for player in self.players)
         return 0 if v1 > v2 else 1
 
     def play(self):
@@ -31,9 +44,8 @@ class Game:
 
             user_input = input(f"\n{player.name}, choose a card (e.g. A♠), 'draw', or 'skip': ").strip()
             if user_input.lower() == 'draw':
-                if player.talon:
-                    card = player.talon.pop()
-                    player.waste.append(card)
+                card = self.draw()
+                if card:
                     print(f"{player.name} drew {card} from talon.")
                 else:
                     print("No cards left in talon.")
@@ -50,7 +62,7 @@ class Game:
                 print("Invalid card format.")
                 continue
 
-            if card not in player.visible_cards():
+            if not player.is_visible(card):
                 print("You can't play that card. It's not visible.")
                 continue
 
@@ -61,8 +73,7 @@ class Game:
 
             pile_index = int(pile_num) - 1
             if self.center.can_play(card, pile_index):
-                self.center.play_card(card, pile_index)
-                player.remove_card(card)
+                self.play_card(card, pile_index)
                 print(f"{player.name} plays {card} to center pile {pile_index + 1}.")
             else:
                 print("You can't place that card there.")
@@ -70,13 +81,68 @@ class Game:
 
             self.end_turn()
 
-        print(f"\n🏆 {self.players[self.turn].name} wins!")
+        print(f"\n🏆 {self.players[self.winner()].name} wins!")
 
-    def check_win(self):
-        for player in self.players:
+    def legal_plays(self):
+        player = self.players[self.turn]
+        return [(card, i) for card in player.visible_cards() for i in range(8) if self.center.can_play(card, i)]
+
+    def play_card(self, card, pile_index):
+        self.center.play_card(card, pile_index)
+        self.players[self.turn].remove_card(card)
+
+    def draw(self):
+        return self.players[self.turn].draw_to_waste()
+
+    def run(self, policy, max_turns=2000, record=None):
+        """
+        Play without input(): policy(game, plays) returns a (card, pile_index)
+        from plays, 'draw' or 'skip'. Returns (winner, turns); winner is None
+        when both players are stuck or max_turns runs out. record(move), if
+        given, gets every turn's move word as it is played.
+        """
+        turns = 0
+        stuck = 0
+        while not self.check_win() and turns < max_turns and stuck < 2:
+            action = policy(self, self.legal_plays())
+            if action == 'draw':
+                progressed = self.draw() is not None
+                move = MOVE_DRAW
+            elif action == 'skip':
+                progressed = False
+                move = MOVE_SKIP
+            else:
+                self.play_card(*action)
+                progressed = True
+                move = encode_play(*action)
+            if record:
+                record(move)
+            stuck = 0 if progressed else stuck + 1
+            self.end_turn()
+            turns += 1
+        return self.winner(), turns
+
+    @classmethod
+    def replay(cls, seed, moves):
+        """Rebuild a recorded game from its seed and move words, no policy involved."""
+        game = cls(seed)
+        for move in moves:
+            if move == MOVE_DRAW:
+                game.draw()
+            elif move != MOVE_SKIP:
+                rank, suit = FACES[(move >> 4 & 3) * len(RANKS) + (move & 0xF)]
+                game.play_card(Card(rank.upper(), suit), move >> 6)
+            game.end_turn()
+        return game
+
+    def winner(self):
+        for i, player in enumerate(self.players):
             if len(player.crapette) == 0 and len(player.talon) == 0 and not player.tableau:
-                return True
-        return False
+                return i
+        return None
+
+    def check_win(self):
+        return self.winner() is not None
 
     def end_turn(self):
         self.turn = 1 - self.turn
@@ -1,6 +1,10 @@
+from card_rules import FOUNDATION, STRIDE, EMPTY
+
 class CenterPiles:
     def __init__(self):
         self.piles = [[] for _ in range(8)]
+        # 🗂️ card -> [(pile index, position)]: both decks share the interned Cards, so a card can be here twice
+        self.where = {}
 
     def show(self):
         print("\nCenter piles:")
@@ -9,12 +13,26 @@ class CenterPiles:
             print(f"  Pile {i+1}: {top}")
 
     def can_play(self, card, pile_index):
+        # Same suit one rank up, aces on empty piles: one lookup in the shared foundation table
         pile = self.piles[pile_index]
-        order = ['A'] + [str(n) for n in range(2, 11)] + ['J', 'Q', 'K']
-        if not pile:
-            return card.rank == 'A'
-        top = pile[-1]
-        return top.suit == card.suit and order.index(card.rank) == order.index(top.rank) + 1
+        return FOUNDATION[card.face * STRIDE + (pile[-1].face if pile else EMPTY)] == 1
 
     def play_card(self, card, pile_index):
-        self.piles[pile_index].append(card)
+        pile = self.piles[pile_index]
+        self.where.setdefault(card, []).append((pile_index, len(pile)))
+        pile.append(card)
+
+    def locate(self, card):
+        return self.where.get(card, [])
+
+    def __contains__(self, card):
+        return card in self.where
+
+    def take_card(self, pile_index):
+        """Lift the top card off a pile (undo, or rules variants that let centre cards move)."""
+        card = self.piles[pile_index].pop()
+        places = self.where[card]
+        places.remove((pile_index, len(self.piles[pile_index])))
+        if not places:
+            del self.where[card]
+        return card
@@ -6,6 +6,11 @@ class Player:
         self.tableau = self.deck.draw(4)
         self.talon = self.deck.cards
         self.waste = []
+        # 🗂️ card -> (pile name, position), kept in step by every method that moves a card
+        self.where = {}
+        for pile in ('crapette', 'tableau', 'talon', 'waste'):
+            for position, card in enumerate(getattr(self, pile)):
+                self.where[card] = (pile, position)
 
     def visible_cards(self):
         cards = self.tableau.copy()
@@ -15,13 +20,39 @@ class Player:
             cards.append(self.waste[-1])
         return cards
 
+    def locate(self, card):
+        """(pile name, position) of card, or None if this player doesn't hold it."""
+        return self.where.get(card)
+
+    def is_visible(self, card):
+        location = self.where.get(card)
+        if location is None:
+            return False
+        pile, position = location
+        if pile == 'tableau':
+            return True
+        return pile != 'talon' and position == len(getattr(self, pile)) - 1
+
     def remove_card(self, card):
-        if card in self.tableau:
-            self.tableau.remove(card)
-        elif self.crapette and self.crapette[-1] == card:
-            self.crapette.pop()
-        elif self.waste and self.waste[-1] == card:
-            self.waste.pop()
+        if not self.is_visible(card):
+            return
+        pile, position = self.where.pop(card)
+        if pile == 'tableau':
+            # At most 4 tableau cards, so shifting the ones after it is still constant work
+            del self.tableau[position]
+            for i in range(position, len(self.tableau)):
+                self.where[self.tableau[i]] = ('tableau', i)
+        else:
+            getattr(self, pile).pop()
+
+    def draw_to_waste(self):
+        """Talon top onto the waste; returns it, or None when the talon is empty."""
+        if not self.talon:
+            return None
+        card = self.talon.pop()
+        self.where[card] = ('waste', len(self.waste))
+        self.waste.append(card)
+        return card
 
     def show(self):
         print(f"\n--- {self.name} ---")
@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend'))
+
+from compact_state import Board
+from crapette_engine import CrapetteEngine, random_policy
+
+# 📼 Records positions from seeded random self-play, one per line:
+#   <turn> <revealed p1/p2 as hex> <pile 0 hex>,<pile 1 hex>,...,<pile 21 hex>
+# Same seed, same corpus; regenerate whenever the position format or the engine's rules change
+# (tests/test_benchmark_corpus.py fails until then).
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'positions.txt')
+
+
+def dump_position(board):
+    return f"{board.turn} {board.revealed.hex()} " + ",".join(pile.hex() for pile in board.piles)
+
+
+def load_position(line):
+    turn, revealed, piles = line.split()
+    board = Board()
+    board.turn = int(turn)
+    board.revealed[:] = bytes.fromhex(revealed)
+    for pile, cards in zip(board.piles, piles.split(',')):
+        pile[:] = bytes.fromhex(cards)
+    board.rehash()
+    return board
+
+
+def load_corpus(path=CORPUS):
+    with open(path) as f:
+        return [load_position(line) for line in f if line.strip()]
+
+
+def record(games=10, every=10, seed=2024):
+    rng = random.Random(seed)
+    policies = [random_policy(random.Random(seed + 1)), random_policy(random.Random(seed + 2))]
+    lines = []
+    for _ in range(games):
+        engine = CrapetteEngine.new_game(rng)
+        while not engine.over:
+            if engine.actions_played % every == 0:
+                lines.append(dump_position(engine.board))
+            actions = engine.legal_actions()
+            engine.apply(policies[engine.turn](engine, actions))
+    return lines
+
+
+if __name__ == "__main__":
+    lines = record()
+    with open(CORPUS, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"📼 {len(lines)} positions → {CORPUS}")
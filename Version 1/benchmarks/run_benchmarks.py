@@ -0,0 +1,406 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+# Headless: no window, no sound card needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # stdout is the JSON report
+os.environ.setdefault('CRAPETTE_WINDOW', '1200x850')      # same board size whatever the desktop
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FRONTEND = os.path.join(HERE, '..', 'frontend')
+SHARED = os.path.join(HERE, '..', 'shared')
+sys.path[:0] = [FRONTEND, SHARED]
+
+import pygame
+
+from make_corpus import load_corpus
+from compact_state import ALL_CODES, decode_card
+from deck import create_deck, deal_cards
+from ui_helpers import has_any_valid_move, can_play_anywhere, suggest_move
+from move_gen import MoveGenerator
+from crapette_engine import deal_board
+
+# ⏱️ Hot-path benchmarks for the frontend. Every bench reports microseconds per
+# call (best of --repeat runs), so results from different machines stay comparable
+# to their own baseline:
+#   python run_benchmarks.py --save-baseline baseline.json
+#   python run_benchmarks.py --baseline baseline.json    (exit 1 on regressions)
+BENCHES = {}
+
+
+def bench(name):
+    def register(fn):
+        BENCHES[name] = fn
+        return fn
+    return register
+
+
+def measure(fn, calls, repeat, min_time=0.05):
+    """fn runs `calls` operations per invocation; returns the best µs per operation."""
+    # Loop fn enough times that one sample isn't dominated by timer and scheduler noise
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / (calls * loops) * 1e6
+
+
+@contextlib.contextmanager
+def quiet():
+    # deal_cards and the checkers print; keep the terminal out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def corpus_positions():
+    # Shared dict cards, as the UI holds them (identity matters for selection)
+    cards = {code: decode_card(code) for code in ALL_CODES}
+    return [board.to_piles(cards) + (board.turn,) for board in load_corpus()]
+
+
+def movers(positions):
+    # (player, opponent, foundations, tableaus) from the point of view of the player to move
+    for p1, p2, fl, fr, tl, tr, turn in positions:
+        player, opponent = (p1, p2) if turn == 0 else (p2, p1)
+        yield player, opponent, fl, fr, tl, tr
+
+
+@bench('has_any_valid_move')
+def bench_has_any_valid_move(ctx):
+    args = list(movers(ctx['positions']))
+
+    def run():
+        for a in args:
+            has_any_valid_move(*a)
+    return run, len(args)
+
+
+@bench('can_play_anywhere')
+def bench_can_play_anywhere(ctx):
+    # Every top card the mover could pick up, as the talon check and hints ask it
+    args = []
+    for player, opponent, fl, fr, tl, tr in movers(ctx['positions']):
+        for pile in [player['crapette'], player['waste']] + tl + tr:
+            if pile:
+                args.append((pile[-1], player, opponent, fl, fr, tl, tr))
+
+    def run():
+        for a in args:
+            can_play_anywhere(*a)
+    return run, len(args)
+
+
+@bench('suggest_move')
+def bench_suggest_move(ctx):
+    args = list(movers(ctx['positions']))
+
+    def run():
+        for a in args:
+            suggest_move(*a)
+    return run, len(args)
+
+
+@bench('move_gen.has_any_valid_move')
+def bench_move_gen(ctx):
+    # The UI's worst case: a card moves, then the question, then it moves back and the question again
+    args = []
+    for position in ctx['positions']:
+        gen, turn = MoveGenerator(*position[:6]), position[6]
+        legal = gen.legal_moves(turn)
+        if legal:
+            src, dst = legal[0]
+            args.append((gen, turn, gen.piles[src], gen.piles[dst], src, dst))
+
+    def run():
+        for gen, turn, src_pile, dst_pile, src, dst in args:
+            dst_pile.append(src_pile.pop())
+            gen.moved(src, dst)
+            gen.has_any_valid_move(turn)
+            src_pile.append(dst_pile.pop())
+            gen.moved(src, dst)
+            gen.has_any_valid_move(turn)
+    return run, 2 * len(args)
+
+
+@bench('move_gen.sync')
+def bench_move_gen_sync(ctx):
+    # The full signature pass, for callers that can't say what moved
+    gens = [(MoveGenerator(*position[:6]), position[6]) for position in ctx['positions']]
+
+    def run():
+        for gen, turn in gens:
+            gen.sync()
+            gen.has_any_valid_move(turn)
+    return run, len(gens)
+
+
+@bench('create_deck')
+def bench_create_deck(ctx):
+    n = 2000
+
+    def run():
+        for _ in range(n):
+            create_deck('red')
+    return run, n
+
+
+@bench('deal_cards')
+def bench_deal_cards(ctx):
+    n = 500
+    rng = random.Random(0)
+
+    def run():
+        with quiet():
+            for _ in range(n):
+                deal_cards(rng)
+    return run, n
+
+
+@bench('deal_board')
+def bench_deal_board(ctx):
+    n = 2000
+    rng = random.Random(0)
+
+    def run():
+        for _ in range(n):
+            deal_board(rng)
+    return run, n
+
+
+def uniqueness_bench(decks):
+    def setup(ctx):
+        from visual_crapette_centerplay import check_card_id_uniqueness
+        # `decks` full decks with distinct owners so every id is unique, spread over the same piles
+        cards = [card for k in range(decks) for card in create_deck(('red', 'blue')[k % 2] + ('' if k < 2 else str(k)))]
+        p1 = {'crapette': cards[0::6], 'talon': cards[1::6], 'waste': cards[2::6]}
+        p2 = {'crapette': cards[3::6], 'talon': cards[4::6], 'waste': []}
+        tableaus = [cards[5::6][i::8] for i in range(8)]
+        n = max(1, 200 // decks)
+
+        def run():
+            with quiet():
+                for _ in range(n):
+                    check_card_id_uniqueness(p1, p2, tableaus[:4], tableaus[4:])
+        return run, n
+    return setup
+
+
+for _decks in (2, 8, 32):
+    bench(f'check_card_id_uniqueness[{_decks * 52}]')(uniqueness_bench(_decks))
+
+
+@bench('centerplay_full_frame')
+def bench_full_frame(ctx):
+    # Everything repainted, as after an expose or the first frame
+    from board_view import BoardView
+    screen = ctx['screen']
+    views = [BoardView(screen, position[:6]) for position in ctx['positions'][::8]]
+
+    def run():
+        for view in views:
+            view.renderer.invalidate()
+            view.render("Player 1", None, "")
+    return run, len(views)
+
+
+@bench('centerplay_select_frame')
+def bench_select_frame(ctx):
+    # The common case: one click selects a card, only its pile is repainted
+    from board_view import BoardView
+    screen = ctx['screen']
+    views = []
+    for position in ctx['positions'][::8]:
+        view = BoardView(screen, position[:6])
+        view.render("Player 1", None, "")
+        pile = next((pile for pile in position[4] if pile), None)
+        views.append((view, pile[-1] if pile else None))
+
+    def run():
+        for view, card in views:
+            view.render("Player 1", card, "")
+            view.render("Player 1", None, "")
+    return run, 2 * len(views)
+
+
+@bench('hit_test')
+def bench_hit_test(ctx):
+    # "What is under the mouse" for card selection and both drop targets, as a click or drag asks it
+    from board_view import BoardView
+    view = BoardView(ctx['screen'], ctx['positions'][len(ctx['positions']) // 2][:6])
+    view.render("Player 1", None, "")
+    rng = random.Random(0)
+    points = [(rng.randrange(1200), rng.randrange(850)) for _ in range(1000)]
+    grids = (view.card_hits, view.foundation_hits, view.tableau_hits)
+
+    def run():
+        for point in points:
+            for grid in grids:
+                grid.at(point)
+    return run, len(points)
+
+
+@bench('event_log_disabled')
+def bench_event_log_disabled(ctx):
+    # A debug record at the default info level: what the click path pays for a filtered-out log call
+    from event_log import EventLog, INFO
+    log = EventLog(level=INFO, echo=False)
+    card = decode_card(ALL_CODES[0])
+
+    def run():
+        for _ in range(1000):
+            log.debug('selection', new=card, selected=card, same=True)
+    return run, 1000
+
+
+@bench('event_log_enabled')
+def bench_event_log_enabled(ctx):
+    # An info record into the ring; formatting and I/O happen on the flusher thread, not here
+    from event_log import EventLog, INFO
+    log = EventLog(level=INFO, echo=False)
+    card = decode_card(ALL_CODES[0])
+
+    def run():
+        for _ in range(1000):
+            log.info('select', card=card)
+    return run, 1000
+
+
+@bench('mcts_playout')
+def bench_mcts_playout(ctx):
+    # One in-process MCTS iteration: determinize, descend, expand, a ROLLOUT_TURNS playout, back up
+    from mcts import grow_tree
+    board = deal_board(random.Random(0))
+
+    def run():
+        grow_tree(board, iterations=200, seed=0)
+    return run, 200
+
+
+# 🚀 Startup, each in a fresh interpreter: what a test run or a player launching the game waits for
+STARTUP_SCRIPTS = {
+    'startup_import_rules': "import ui_helpers, move_gen, hint_search, crapette_engine, card_ledger",
+    'startup_import_ui': "import visual_crapette_centerplay, pygame; assert not pygame.display.get_init()",
+    # Until the first frame reaches the display, then straight out
+    'startup_first_frame': (
+        "import os, pygame\n"
+        "def shown(*args): os._exit(0)\n"
+        "pygame.display.update = pygame.display.flip = shown\n"
+        "import visual_crapette_centerplay\n"
+        "visual_crapette_centerplay.main()\n"
+    ),
+}
+
+
+SUBPROCESS_ENV = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SHARED, os.environ.get('PYTHONPATH')])))
+
+
+def startup_bench(script):
+    def make(ctx):
+        def run():
+            subprocess.run([sys.executable, '-c', script], cwd=FRONTEND, check=True, env=SUBPROCESS_ENV,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return run, 1
+    return make
+
+
+for _name, _script in STARTUP_SCRIPTS.items():
+    bench(_name)(startup_bench(_script))
+
+
+def run_benches(names, repeat):
+    ctx = {'positions': corpus_positions()}
+    pygame.init()
+    ctx['screen'] = pygame.display.set_mode((1200, 850))
+    results = {}
+    for name in names:
+        fn, calls = BENCHES[name](ctx)
+        fn()  # warm-up: atlas build, font caches, lazy imports
+        results[name] = {'us_per_call': measure(fn, calls, repeat), 'calls': calls}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Ratios against the baseline; anything slower than threshold counts as a regression."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+        ratio = result['us_per_call'] / base['us_per_call']
+        result['baseline_us'] = base['us_per_call']
+        result['ratio'] = ratio
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Crapette frontend hot paths.")
+    parser.add_argument('--only', nargs='*', help="bench names to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="write the JSON report here as well as to stdout")
+    parser.add_argument('--save-baseline', help="write the results as a baseline file")
+    parser.add_argument('--baseline', help="compare against a saved baseline")
+    parser.add_argument('--threshold', type=float, default=1.25, help="slowdown ratio that counts as a regression")
+    parser.add_argument('--list', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHES))
+        return 0
+    names = args.only or list(BENCHES)
+    unknown = [name for name in names if name not in BENCHES]
+    if unknown:
+        parser.error(f"unknown bench: {', '.join(unknown)}")
+
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'repeat': args.repeat,
+        'results': run_benches(names, args.repeat),
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report['results'], json.load(f), args.threshold)
+        report['regressions'] = regressions
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            f.write(text + "\n")
+
+    for name, result in report['results'].items():
+        ratio = f"  ×{result['ratio']:.2f}" if 'ratio' in result else ""
+        print(f"{'🐢' if name in regressions else '⏱️'} {name:34} {result['us_per_call']:10.1f} µs{ratio}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,11 @@
-import pygame
+import os
+import sys
 
-pygame.init()
-info = pygame.display.Info()
-screen = pygame.display.set_mode((info.current_w, info.current_h))
-print(f"Screen resolution: {info.current_w} x {info.current_h}")
-pygame.quit()
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, 'frontend'), os.path.join(HERE, 'shared')]
+
+from layout import screen_size
+
+if __name__ == "__main__":
+    width, height = screen_size()
+    print(f"Screen resolution: {width} x {height}")
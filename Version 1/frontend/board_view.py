@@ -0,0 +1,234 @@
+import pygame
+from ui_draw import draw_card, draw_slot, draw_label, draw_stack, draw_turn_button, draw_crapette_button, FONT, CARD_ATLAS
+from render_layer import DirtyRenderer, pile_signature, fan_signature
+from text_cache import render_text
+from hit_index import HitGrid
+from layout import Layout
+
+GREEN = (0, 100, 80)
+FOUNDATION_SUITS = ['♥', '♠', '♣', '♦']
+# First match wins where clickable cards overlap, in the order the old card_areas scan used
+CARD_PRIORITY = {key: i for i, key in enumerate(['waste', 'crapette', 'p2_waste', 'p2_crapette'] +
+                                                [(source, i) for i in range(4) for source in ('tableau_left', 'tableau_right')])}
+
+
+def talon_signature(player, show_revealed, selected_card):
+    revealed = player.get('revealed') if show_revealed else None
+    return min(5, len(player['talon'])), id(revealed), revealed is not None and revealed is selected_card
+
+
+class BoardView:
+    """
+    The centerplay board as a list of regions for the DirtyRenderer: every
+    coordinate comes from a Layout worked out once per window size, the felt
+    and labels are painted once into the renderer's background, each pile
+    paints a cached composite, and the clickable areas of every region
+    persist between frames in hit-test grids that are only updated when a
+    region is redrawn.
+    """
+
+    def __init__(self, screen, state):
+        self.screen = screen
+        self.player1, self.player2, self.foundation_left, self.foundation_right, self.tableau_left, self.tableau_right = state
+        self.current_turn = "Player 1"
+        self.selected_card = None
+        self.suggestion_text = ""
+        self.overlays = []  # callables returning extra (key, signature, draw) regions drawn on top
+        self.flight = None  # a bot_player.CardFlight on its way to its pile, drawn over everything
+        self.renderer = DirtyRenderer(screen, GREEN)
+
+        # 🧭 Clickable areas per region; only dirty regions are redrawn, so these persist between frames
+        self.card_hits = HitGrid()         # top cards: (rect, card, source, index)
+        self.foundation_hits = HitGrid()   # (rect, side, i)
+        self.tableau_hits = HitGrid()      # (top rect, side, i)
+        self.buttons = {'end_turn': pygame.Rect(0, 0, 0, 0), 'crapette': pygame.Rect(0, 0, 0, 0)}
+        self.resize(screen)
+
+    def resize(self, screen):
+        """New window size (or the first one): the only place the layout is computed."""
+        self.screen = self.renderer.screen = screen
+        self.layout = Layout(*screen.get_size())
+        self.width, self.height = self.layout.size
+        CARD_ATLAS.set_card_size(self.layout.card_size)
+        self.renderer.background = None  # rebuilt on the next draw, which also repaints everything
+
+    def set_card_area(self, key, rect, card, index=None):
+        source = key[0] if index is not None else key
+        self.card_hits.set(key, rect, (rect, card, source, index), CARD_PRIORITY[key])
+
+    def build_background(self):
+        # 🎨 Static layer, painted once per layout: the felt and every pile label
+        layout = self.layout
+        background = pygame.Surface(layout.size)
+        background.fill(GREEN)
+        for p, labels in ((0, ("Talon", "Discard", "Crapette")), (1, ("Talon", None, "Crapette"))):
+            for x, label in zip((layout.talon_x, layout.waste_x, layout.crapette_x), labels):
+                if label:
+                    draw_label(label, x, layout.row_of[p], background, layout.label_offset)
+        self.renderer.set_background(background)
+
+    # 🃏 Piles: each one is a cached composite, re-painted only when its signature changes
+
+    def draw_talon(self, key, signature, player, p, back_color, turn):
+        layout = self.layout
+        x, y, size, step = layout.talon_x, layout.row_of[p], layout.card_size, layout.back_offset
+        revealed = player.get('revealed') if self.current_turn == turn else None
+        count = min(5, len(player['talon']))
+
+        def paint(surface, dx, dy):
+            # Draw stacked backs
+            for i in range(count):
+                draw_card(x + i * step + dx, y + dy, {}, hidden=True, screen=surface, back_color=back_color, size=size)
+            # ✅ Only draw the revealed talon card on its owner's turn
+            if revealed:
+                draw_card(x + dx, y + dy, revealed, self.selected_card == revealed, screen=surface, size=size)
+
+        return self.renderer.composite(key, signature, pygame.Rect(x, y, size[0] + 4 * step, size[1]), paint)
+
+    def draw_waste(self, key, signature, player, p, source):
+        rect = self.layout.waste_rect(p)
+        top = player['waste'][-1] if player['waste'] else None
+        if top:
+            self.set_card_area(source, rect, top)
+        else:
+            self.card_hits.remove(source)
+
+        def paint(surface, dx, dy):
+            if top:
+                draw_card(rect.x + dx, rect.y + dy, top, self.selected_card is top, screen=surface, size=rect.size)
+            else:
+                draw_slot(rect.x + dx, rect.y + dy, surface, rect.size)
+
+        return self.renderer.composite(key, signature, rect, paint)
+
+    def draw_crapette(self, key, signature, player, p, source, back_color):
+        rect = self.layout.crapette_rect(p)
+        step = self.layout.back_offset
+        top = player['crapette'][-1] if player['crapette'] else None
+        if top:
+            self.set_card_area(source, rect, top)
+        else:
+            self.card_hits.remove(source)
+
+        def paint(surface, dx, dy):
+            x, y = rect.x + dx, rect.y + dy
+            if top:
+                for i in range(11):
+                    draw_card(x + i * step, y, {}, hidden=True, screen=surface, back_color=back_color, size=rect.size)
+                draw_card(x, y, top, self.selected_card == top, screen=surface, back_color=back_color, size=rect.size)
+            else:
+                draw_slot(x, y, surface, rect.size)
+
+        return self.renderer.composite(key, signature, pygame.Rect(rect.x, rect.y, rect.width + 10 * step, rect.height), paint)
+
+    def draw_foundation(self, key, signature, side, i):
+        rect = self.layout.foundation_rect(side, i)
+        pile = self.foundation_left[i] if side == 'left' else self.foundation_right[i]
+        self.foundation_hits.set((side, i), rect, (rect, side, i))
+
+        def paint(surface, dx, dy):
+            x, y = rect.x + dx, rect.y + dy
+            if pile:
+                draw_card(x, y, pile[-1], self.selected_card is pile[-1], screen=surface, size=rect.size)
+                return
+            draw_slot(x, y, surface, rect.size)
+            suit = FOUNDATION_SUITS[i]
+            color = (200, 0, 0) if suit in ['♥', '♦'] else (0, 0, 0)
+            suit_text = render_text(FONT, suit, True, color)
+            surface.blit(suit_text, suit_text.get_rect(center=(x + rect.width // 2, y + rect.height // 2)))
+
+        return self.renderer.composite(key, signature, rect, paint)
+
+    def draw_tableau(self, key, signature, side, i):
+        layout = self.layout
+        source = 'tableau_' + side
+        pile = self.tableau_left[i] if side == 'left' else self.tableau_right[i]
+        top_rect = layout.tableau_top_rect(side, i, len(pile))
+        if pile:
+            self.set_card_area((source, i), top_rect, pile[-1], i)
+        else:
+            self.card_hits.remove((source, i))
+        self.tableau_hits.set((side, i), top_rect, (top_rect, side, i))
+
+        x, y = layout.tx_left if side == 'left' else layout.tx_right, layout.row_y[i]
+
+        def paint(surface, dx, dy):
+            if pile:
+                draw_stack(x + dx, y + dy, pile, self.selected_card, screen=surface, direction=side,
+                           offset=layout.fan_offset, size=layout.card_size)
+            else:
+                draw_slot(x + dx, y + dy, surface, layout.card_size)
+
+        return self.renderer.composite(key, signature, layout.tableau_rect(side, i, len(pile)), paint)
+
+    def draw_buttons(self):
+        self.buttons['end_turn'] = draw_turn_button(self.current_turn, self.screen, self.layout.end_turn_button)
+        self.buttons['crapette'] = draw_crapette_button(self.screen, self.layout.crapette_button)
+        return self.buttons['end_turn'].union(self.buttons['crapette'])
+
+    def draw_hint(self):
+        if not self.suggestion_text:
+            return pygame.Rect(self.layout.hint_pos, (0, 0))
+        help_surface = render_text(FONT, self.suggestion_text, True, (255, 255, 255))  # white text
+        return self.screen.blit(help_surface, self.layout.hint_pos)  # draw it near the bottom
+
+    def draw_flight(self, x, y):
+        return draw_card(x, y, self.flight.card, screen=self.screen, size=self.layout.card_size)
+
+    def flight_region(self):
+        if self.flight is None:
+            return 'flight', None, lambda: pygame.Rect(0, 0, 0, 0)
+        x, y = self.flight.position()
+        return 'flight', (id(self.flight), x, y), lambda: self.draw_flight(x, y)
+
+    def regions(self):
+        # (key, signature, draw) back to front; a region is redrawn only when its signature changes
+        player1, player2, selected_card = self.player1, self.player2, self.selected_card
+
+        def pile(key, signature, draw, *args):
+            return key, signature, lambda: draw(key, signature, *args)
+
+        regions = [
+            pile('p1_talon', talon_signature(player1, self.current_turn == "Player 1", selected_card),
+                 self.draw_talon, player1, 0, "red", "Player 1"),
+            pile('p1_waste', pile_signature(player1['waste'], selected_card), self.draw_waste, player1, 0, 'waste'),
+            pile('p1_crapette', pile_signature(player1['crapette'], selected_card),
+                 self.draw_crapette, player1, 0, 'crapette', "red"),
+            pile('p2_talon', talon_signature(player2, self.current_turn == "Player 2", selected_card),
+                 self.draw_talon, player2, 1, "blue", "Player 2"),
+            pile('p2_waste', pile_signature(player2['waste'], selected_card), self.draw_waste, player2, 1, 'p2_waste'),
+            pile('p2_crapette', pile_signature(player2['crapette'], selected_card),
+                 self.draw_crapette, player2, 1, 'p2_crapette', "blue"),
+            ('buttons', self.current_turn, self.draw_buttons),
+        ]
+        for i in range(4):
+            regions += [
+                pile(('foundation_left', i), pile_signature(self.foundation_left[i], selected_card),
+                     self.draw_foundation, 'left', i),
+                pile(('foundation_right', i), pile_signature(self.foundation_right[i], selected_card),
+                     self.draw_foundation, 'right', i),
+                pile(('tableau_left', i), fan_signature(self.tableau_left[i], selected_card),
+                     self.draw_tableau, 'left', i),
+                pile(('tableau_right', i), fan_signature(self.tableau_right[i], selected_card),
+                     self.draw_tableau, 'right', i),
+            ]
+        regions.append(('hint', self.suggestion_text, self.draw_hint))
+        regions.append(self.flight_region())
+        regions += [overlay() for overlay in self.overlays]
+        return regions
+
+    def draw(self, current_turn, selected_card, suggestion_text):
+        """Repaint what changed since the last call, without touching the display yet."""
+        self.current_turn = current_turn
+        self.selected_card = selected_card
+        self.suggestion_text = suggestion_text
+        if self.renderer.background is None:
+            self.build_background()
+        return self.renderer.render(self.regions())
+
+    def present(self):
+        return self.renderer.present()
+
+    def render(self, current_turn, selected_card, suggestion_text):
+        self.draw(current_turn, selected_card, suggestion_text)
+        return self.present()
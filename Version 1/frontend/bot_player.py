@@ -0,0 +1,207 @@
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+from compact_state import PILE_COUNT, FOUNDATION_LEFT
+from crapette_engine import CrapetteEngine, DRAW_TALON, END_TURN, describe_action
+from hint_search import HintSearch
+from mcts import MCTS
+from event_log import LOG
+
+# 🤖 Computer opponent for the pygame board. The UI hands the bot a Board
+# snapshot when its turn starts; a worker thread plays the turn through a
+# CrapetteEngine and posts each action to a move queue as soon as it's
+# decided. The UI loop only ever polls that queue, so it keeps drawing at
+# its frame rate however long the bot thinks, and animates each move as it
+# comes in.
+#
+#   CRAPETTE_BOT=search|mcts|random   who plays Player 2 (unset: a human)
+#   CRAPETTE_BOT_THINK=0.3            seconds per decision: the search budget, or the pause for random
+#   CRAPETTE_BOT_ANIM=0.25            seconds a card takes to fly to its pile
+BOT_POLICY = os.environ.get('CRAPETTE_BOT')
+THINK_TIME = float(os.environ.get('CRAPETTE_BOT_THINK', '0.3'))
+ANIMATION_TIME = float(os.environ.get('CRAPETTE_BOT_ANIM', '0.25'))
+# While the bot thinks, the UI thread gets the GIL back after at most this long
+# (Python's default 5 ms costs a CPU-bound bot's opponent ~15 fps)
+SWITCH_INTERVAL = 0.001
+
+
+def search_policy(think_time):
+    """Best line from HintSearch within think_time; turn the talon or end the turn once nothing improves."""
+    search = HintSearch(budget=think_time)
+
+    def policy(engine, actions):
+        result = search.search(engine.board)
+        if result['moves'] and result['moves'][0] in actions:
+            return result['moves'][0]
+        return DRAW_TALON if DRAW_TALON in actions else END_TURN
+    return policy
+
+
+def paced_random_policy(think_time, rng=None):
+    """Any legal move, after a think_time pause so a human can follow along."""
+    rng = rng or random.Random()
+
+    def policy(engine, actions):
+        time.sleep(think_time)
+        card_moves = [a for a in actions if a != END_TURN]
+        return rng.choice(card_moves) if card_moves else END_TURN
+    return policy
+
+
+def mcts_policy(think_time):
+    """MCTS over the whole game, think_time per decision, on CRAPETTE_MCTS_WORKERS processes."""
+    return MCTS(budget=think_time).policy()
+
+
+POLICIES = {'search': search_policy, 'mcts': mcts_policy, 'random': paced_random_policy}
+
+
+def ui_pile(state, pile_id):
+    """The frontend list behind a compact_state pile id; state is deal_cards()' six piles."""
+    player1, player2, foundation_left, foundation_right, tableau_left, tableau_right = state
+    if pile_id < FOUNDATION_LEFT:
+        player = (player1, player2)[pile_id // 3]
+        return player[('crapette', 'talon', 'waste')[pile_id % 3]]
+    stacks = (foundation_left, foundation_right, tableau_left, tableau_right)[(pile_id - FOUNDATION_LEFT) // 4]
+    return stacks[(pile_id - FOUNDATION_LEFT) % 4]
+
+
+class BotPlayer:
+    """
+    One worker thread per bot. start_turn(board) queues a turn; next_move()
+    returns (action, think seconds) for the next decided action, or None if
+    the bot is still thinking. END_TURN is always the last action of a turn.
+    Every decision's wall time is kept in think_times.
+    """
+
+    def __init__(self, policy='search', think_time=THINK_TIME, player=1):
+        self.player = player
+        self.name = f"Player {player + 1}"
+        self.think_time = think_time
+        self.policy = POLICIES[policy](think_time)
+        self.policy_name = policy
+        self.requests = queue.Queue()
+        self.moves = queue.Queue()
+        self.in_turn = False       # UI side: a turn was started and its END_TURN not yet taken
+        self.thread = None
+        self.think_times = []
+        self.turns = 0
+        self.saved_interval = None
+
+    @classmethod
+    def from_env(cls):
+        if not BOT_POLICY:
+            return None
+        return cls(BOT_POLICY if BOT_POLICY in POLICIES else 'search')
+
+    def start_turn(self, board):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="crapette-bot", daemon=True)
+            self.thread.start()
+        self.in_turn = True
+        if self.saved_interval is None:
+            self.saved_interval = sys.getswitchinterval()
+            sys.setswitchinterval(SWITCH_INTERVAL)
+        self.requests.put(board)
+
+    def next_move(self):
+        try:
+            move = self.moves.get_nowait()
+        except queue.Empty:
+            return None
+        if move[0] == END_TURN:
+            self.in_turn = False
+            if self.saved_interval is not None:
+                sys.setswitchinterval(self.saved_interval)
+                self.saved_interval = None
+        return move
+
+    def stop(self):
+        if self.saved_interval is not None:
+            sys.setswitchinterval(self.saved_interval)
+            self.saved_interval = None
+        if self.thread is not None:
+            self.requests.put(None)
+        close = getattr(self.policy, 'close', None)
+        if close:
+            close()  # the MCTS worker pool
+
+    # 🧵 Worker thread
+
+    def _run(self):
+        while True:
+            board = self.requests.get()
+            if board is None:
+                return
+            self.play_turn(board)
+
+    def play_turn(self, board):
+        engine = CrapetteEngine(board, check_cards=False)
+        while True:
+            actions = engine.legal_actions()
+            start = time.perf_counter()
+            action = self.policy(engine, actions) if len(actions) > 1 else END_TURN
+            think = time.perf_counter() - start
+            self.think_times.append(think)
+            LOG.debug('bot_move', player=self.name, action=describe_action(action), think_ms=round(think * 1000, 1))
+            self.moves.put((action, think))
+            if action == END_TURN:
+                self.turns += 1
+                return
+            engine.apply(action)
+
+    def stats(self):
+        times = sorted(self.think_times)
+        if not times:
+            return {'policy': self.policy_name, 'turns': self.turns, 'decisions': 0}
+        return {
+            'policy': self.policy_name,
+            'think_budget_ms': round(self.think_time * 1000, 1),
+            'turns': self.turns,
+            'decisions': len(times),
+            'think_mean_ms': round(1000 * sum(times) / len(times), 2),
+            'think_p95_ms': round(1000 * times[min(len(times) - 1, int(0.95 * len(times)))], 2),
+            'think_max_ms': round(1000 * times[-1], 2),
+        }
+
+
+class CardFlight:
+    """
+    A bot move on its way: the card has left its source pile and lands on
+    the destination after `duration`. region() is a DirtyRenderer overlay,
+    so only the strip the card moves through is repainted each frame.
+    pile_id is the destination's compact_state id, for whoever tracks piles.
+    """
+
+    def __init__(self, card, dst_pile, src_rect, dst_rect, duration=ANIMATION_TIME, pile_id=None):
+        self.card = card
+        self.dst_pile = dst_pile
+        self.pile_id = pile_id
+        self.src_rect = src_rect
+        self.dst_rect = dst_rect
+        self.duration = duration
+        self.start = time.perf_counter()
+
+    @property
+    def done(self):
+        return time.perf_counter() - self.start >= self.duration
+
+    def position(self):
+        t = min(1.0, (time.perf_counter() - self.start) / self.duration) if self.duration > 0 else 1.0
+        t = 1 - (1 - t) ** 2  # ease out
+        return (round(self.src_rect.x + (self.dst_rect.x - self.src_rect.x) * t),
+                round(self.src_rect.y + (self.dst_rect.y - self.src_rect.y) * t))
+
+    def land(self):
+        self.dst_pile.append(self.card)
+
+
+def take_card(state, pile_id):
+    """Pop the top card of a pile id (revealed talon cards included) from the frontend piles."""
+    if pile_id >= PILE_COUNT:
+        return state[pile_id - PILE_COUNT].pop('revealed')
+    return ui_pile(state, pile_id).pop()
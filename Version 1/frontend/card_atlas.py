@@ -0,0 +1,121 @@
+import os
+import pygame
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "cards")
+
+# Sprite-sheet layout: one row per suit (13 faces), last row holds the backs
+SHEET_SUITS = ['spades', 'hearts', 'diamonds', 'clubs']
+SHEET_RANKS = ['a'] + [str(n) for n in range(2, 11)] + ['j', 'q', 'k']
+BACK_COLORS = ['red', 'blue']
+RANK_IMAGE_MAP = {'a': 'ace', 'j': 'jack', 'q': 'queen', 'k': 'king'}
+
+
+def face_id(card):
+    # Faces are shared by both decks, so the owner is not part of the key
+    if not card or 'suit_name' not in card:
+        return None
+    return f"{card['suit_name']}_{card['rank'].lower()}"  # e.g. diamonds_8
+
+
+def back_id(back_color):
+    return f"{back_color}_back"
+
+
+def image_filename(atlas_id):
+    if atlas_id.endswith("_back"):
+        return f"{atlas_id}.png"
+    suit_name, rank = atlas_id.split("_")
+    return f"{suit_name}_{RANK_IMAGE_MAP.get(rank, rank)}.png"
+
+
+class CardAtlas:
+    """
+    All 52 faces plus both backs, scaled to the card size and packed into a
+    single sprite sheet. Each cell is loaded the first time its card is drawn,
+    so the first frame only decodes the handful of cards it shows; after
+    that lookups never touch the disk. The sheet is rebuilt only when the
+    card size or the display mode changes.
+    """
+
+    def __init__(self, card_size, asset_dir=ASSET_DIR):
+        self.card_size = tuple(card_size)
+        self.asset_dir = asset_dir
+        self.sheet = None
+        self.cells = {}        # atlas id -> Rect inside the sheet, once loaded
+        self.layout = {}       # atlas id -> Rect it will go in
+        self.failed = set()    # ids whose image couldn't be loaded
+        self.hits = 0          # blits served from the sheet
+        self.misses = 0        # lookups with no sprite (caller draws a fallback)
+        self.disk_loads = 0    # PNG decodes, should stay flat after the first frame
+        self.rebuilds = 0
+        self._built_for = None
+
+    def _display_key(self):
+        display = pygame.display.get_surface() if pygame.display.get_init() else None
+        if display is None:
+            return self.card_size, None
+        return self.card_size, display.get_size(), display.get_bitsize()
+
+    def set_card_size(self, card_size):
+        if tuple(card_size) != self.card_size:
+            self.card_size = tuple(card_size)
+            self.sheet = None
+
+    def build(self):
+        width, height = self.card_size
+        ids = [f"{suit}_{rank}" for suit in SHEET_SUITS for rank in SHEET_RANKS]
+        ids += [back_id(color) for color in BACK_COLORS]
+        columns = len(SHEET_RANKS)
+        rows = (len(ids) + columns - 1) // columns
+
+        sheet = pygame.Surface((columns * width, rows * height), pygame.SRCALPHA)
+        # Match the display pixel format once so every blit is a plain copy
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+
+        self.sheet = sheet
+        self.layout = {atlas_id: pygame.Rect((n % columns) * width, (n // columns) * height, width, height)
+                       for n, atlas_id in enumerate(ids)}
+        self.cells = {}
+        self.failed = set()
+        self.rebuilds += 1
+        self._built_for = self._display_key()
+
+    def load(self, atlas_id):
+        cell = self.layout.get(atlas_id)
+        if cell is None or atlas_id in self.failed:
+            return None
+        path = os.path.join(self.asset_dir, image_filename(atlas_id))
+        try:
+            img = pygame.image.load(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"⚠️ Error loading image {path}: {e}")
+            self.failed.add(atlas_id)
+            return None
+        self.disk_loads += 1
+        self.sheet.blit(pygame.transform.smoothscale(img, self.card_size), cell)
+        self.cells[atlas_id] = cell
+        return cell
+
+    def ensure(self):
+        if self.sheet is None or self._built_for != self._display_key():
+            self.build()
+
+    def blit(self, screen, atlas_id, pos):
+        self.ensure()
+        cell = self.cells.get(atlas_id) or self.load(atlas_id)
+        if cell is None:
+            self.misses += 1
+            return False
+        screen.blit(self.sheet, pos, cell)
+        self.hits += 1
+        return True
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_loads': self.disk_loads,
+            'rebuilds': self.rebuilds,
+            'sprites': len(self.cells),
+        }
@@ -0,0 +1,179 @@
+import os
+from collections import Counter
+
+from deck import create_deck
+from compact_state import ALL_CODES, NO_CARD, PILE_COUNT, card_name
+
+# 🧮 Card conservation: both decks, 104 cards, each in exactly one place.
+EXPECTED_IDS = frozenset(card['id'] for owner in ('red', 'blue') for card in create_deck(owner))
+EXPECTED_CODES = frozenset(ALL_CODES)
+
+# Opt-in debug mode: check after every move in the UI and in CrapetteEngine games
+CHECK_CARDS = bool(os.environ.get('CRAPETTE_CHECK_CARDS'))
+
+
+class CardConservationError(Exception):
+    """Raised with a precise diff when a card is lost, duplicated or appears from nowhere."""
+
+    def __init__(self, message, lost=(), duplicated=(), unexpected=()):
+        super().__init__(message)
+        self.lost = dict(lost)                # card -> where it was last seen
+        self.duplicated = dict(duplicated)    # card -> every place it is now
+        self.unexpected = dict(unexpected)    # card -> where it turned up
+
+
+def ui_piles(player1, player2, foundation_left, foundation_right, tableau_left, tableau_right):
+    """Every place a card can be in the pygame frontend, revealed talon cards included."""
+    piles = []
+    for name, player in (('p1', player1), ('p2', player2)):
+        piles += [(f"{name}_crapette", player['crapette']), (f"{name}_talon", player['talon']),
+                  (f"{name}_waste", player['waste'])]
+        revealed = player.get('revealed')
+        piles.append((f"{name}_revealed", (revealed,) if revealed else ()))
+    for side, stacks in (('foundation_left', foundation_left), ('foundation_right', foundation_right),
+                         ('tableau_left', tableau_left), ('tableau_right', tableau_right)):
+        piles += [(f"{side}[{i}]", pile) for i, pile in enumerate(stacks)]
+    return piles
+
+
+# Board pile ids under the same names, in compact_state order, then the revealed slots
+BOARD_PILE_NAMES = ([f"{name}_{pile}" for name in ('p1', 'p2') for pile in ('crapette', 'talon', 'waste')] +
+                    [f"{side}[{i}]" for side in ('foundation_left', 'foundation_right', 'tableau_left', 'tableau_right')
+                     for i in range(4)] +
+                    ['p1_revealed', 'p2_revealed'])
+
+
+def board_piles(board):
+    """Same for a compact_state.Board."""
+    piles = list(zip(BOARD_PILE_NAMES, board.piles))
+    for p, code in enumerate(board.revealed):
+        piles.append((BOARD_PILE_NAMES[PILE_COUNT + p], (code,) if code != NO_CARD else ()))
+    return piles
+
+
+def card_id(card):
+    return card['id']
+
+
+def conservation_diff(piles, key=card_id, expected=EXPECTED_IDS):
+    """
+    Full set-based check, O(cards): returns (lost, duplicated, unexpected),
+    each {card: locations}. All empty means every expected card is there once.
+    """
+    where = {}
+    counts = Counter()
+    for name, pile in piles:
+        for card in pile:
+            k = key(card)
+            counts[k] += 1
+            where.setdefault(k, []).append(name)
+    lost = {k: [] for k in expected if k not in counts}
+    duplicated = {k: where[k] for k, n in counts.items() if n > 1}
+    unexpected = {k: where[k] for k in counts if k not in expected}
+    return lost, duplicated, unexpected
+
+
+def describe_diff(lost, duplicated, unexpected, describe=str):
+    lines = []
+    for k, places in lost.items():
+        lines.append(f"lost {describe(k)}" + (f" from {', '.join(map(str, places))}" if places else ""))
+    for k, places in duplicated.items():
+        lines.append(f"duplicated {describe(k)} in {', '.join(map(str, places))}")
+    for k, places in unexpected.items():
+        lines.append(f"unexpected {describe(k)} in {', '.join(map(str, places))}")
+    return "; ".join(lines)
+
+
+def verify_cards(piles, key=card_id, expected=EXPECTED_IDS, describe=str):
+    lost, duplicated, unexpected = conservation_diff(piles, key, expected)
+    if lost or duplicated or unexpected:
+        raise CardConservationError("❌ Card conservation broken: " + describe_diff(lost, duplicated, unexpected, describe),
+                                    lost, duplicated, unexpected)
+
+
+class CardLedger:
+    """
+    Remembers where every card is and checks each move against it.
+
+    piles_fn() returns [(name, pile)] for every place a card can be; piles are
+    stacks (cards only come and go at the top). check() only looks at piles
+    whose (size, top) changed since the last check and only at the cards that
+    moved, so a move costs a constant amount of work rather than a scan of
+    all 104 cards. Every card that left a pile must have landed somewhere,
+    and every card that arrived must have left somewhere, otherwise it raises
+    CardConservationError naming the cards and piles involved. It returns the
+    moves it saw as (card, from, to), which is what game recording uses.
+    """
+
+    def __init__(self, piles_fn, key=card_id, expected=EXPECTED_IDS, describe=str):
+        self.piles_fn = piles_fn
+        self.key = key
+        self.describe = describe
+        self.checks = 0
+        self.moves_seen = 0
+        piles = piles_fn()
+        verify_cards(piles, key, expected, describe)
+        self.location = {}
+        self.snapshots = {}
+        for name, pile in piles:
+            keys = [key(card) for card in pile]
+            self.snapshots[name] = keys
+            for k in keys:
+                self.location[k] = name
+
+    def check(self):
+        key = self.key
+        self.checks += 1
+        removed, added = {}, []
+        for name, pile in self.piles_fn():
+            old = self.snapshots[name]
+            n = len(pile)
+            if n == len(old) and (not n or key(pile[-1]) == old[-1]):
+                continue
+            m = len(old)
+            if n < m and (not n or key(pile[-1]) == old[n - 1]):
+                gone, came = old[n:], []           # popped
+                del old[n:]
+            elif n > m and (not m or key(pile[m - 1]) == old[-1]):
+                gone, came = [], [key(card) for card in pile[m:]]   # pushed
+                old += came
+            else:
+                # Rewritten below the top: compare the whole pile
+                new = [key(card) for card in pile]
+                common = 0
+                while common < min(n, m) and new[common] == old[common]:
+                    common += 1
+                gone, came = old[common:], new[common:]
+                self.snapshots[name] = new
+            for k in gone:
+                removed[k] = name
+            added += [(k, name) for k in came]
+
+        if not removed and not added:
+            return []
+        lost, duplicated, unexpected = {}, {}, {}
+        moves = []
+        for k, name in added:
+            if k in removed:
+                moves.append((k, removed.pop(k), name))
+                self.location[k] = name
+                self.moves_seen += 1
+            elif k not in self.location:
+                unexpected[k] = [name]
+            else:
+                duplicated[k] = [self.location[k], name]
+        for k, name in removed.items():
+            lost[k] = [name]
+        if lost or duplicated or unexpected:
+            # Resync so one broken move doesn't keep raising on every later check
+            self.location.update((k, places[-1]) for k, places in duplicated.items())
+            for k in lost:
+                del self.location[k]
+            raise CardConservationError("❌ Card conservation broken: " +
+                                        describe_diff(lost, duplicated, unexpected, self.describe),
+                                        lost, duplicated, unexpected)
+        return moves
+
+
+def board_ledger(board):
+    return CardLedger(lambda: board_piles(board), key=int, expected=EXPECTED_CODES, describe=card_name)
@@ -0,0 +1,79 @@
+import contextlib
+import io
+import os
+import random
+import sys
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+
+from deck import deal_cards
+from move_gen import MoveGenerator
+from ui_helpers import has_any_valid_move, can_play_anywhere, suggest_move
+
+# Randomized differential check: the incremental MoveGenerator must agree with
+# the full rescans in ui_helpers after every single card movement.
+# tests/test_move_gen.py runs a few thousand positions of it; this is the long
+# run (python check_move_gen.py [seed]).
+
+
+def rescan_answers(p, state):
+    player1, player2, foundation_left, foundation_right, tableau_left, tableau_right = state
+    player, opponent = (player1, player2) if p == 0 else (player2, player1)
+    board = (foundation_left, foundation_right, tableau_left, tableau_right)
+    crapette_playable = bool(player['crapette']) and can_play_anywhere(player['crapette'][-1], player, opponent, *board)
+    return has_any_valid_move(player, opponent, *board), crapette_playable, suggest_move(player, opponent, *board)
+
+
+def generator_answers(p, moves):
+    return moves.has_any_valid_move(p), moves.crapette_playable(p), moves.suggest_move(p)
+
+
+def random_step(rng, moves, state):
+    """Play a legal move most of the time; otherwise shove any top card anywhere to reach odd positions."""
+    player1, player2 = state[0], state[1]
+    p = rng.randrange(2)
+    player = player1 if p == 0 else player2
+    legal = moves.legal_moves(p)
+    roll = rng.random()
+    if legal and roll < 0.6:
+        src, dst = rng.choice(legal)
+    elif player['talon'] and roll < 0.8:
+        player['waste'].append(player['talon'].pop())
+        return [('waste', p)]
+    else:
+        sources = [key for key, pile in moves.piles.items() if pile]
+        if not sources:
+            return []
+        src = rng.choice(sources)
+        dst = rng.choice([key for key in list(moves.piles) if key != src])
+    moves.piles[dst].append(moves.piles[src].pop())
+    return [src, dst]
+
+
+def run(games=200, steps=150, seed=0, use_sync=False):
+    rng = random.Random(seed)
+    checked = 0
+    for _ in range(games):
+        with contextlib.redirect_stdout(io.StringIO()):
+            state = deal_cards(rng)
+        moves = MoveGenerator(*state)
+        for _ in range(steps):
+            touched = random_step(rng, moves, state)
+            if use_sync:
+                moves.sync()
+            else:
+                moves.moved(*touched)
+            for p in (0, 1):
+                expected = rescan_answers(p, state)
+                actual = generator_answers(p, moves)
+                if expected != actual:
+                    raise AssertionError(f"Player {p + 1} mismatch after {checked} checks:\n  rescan:    {expected}\n  generator: {actual}")
+                checked += 1
+    return checked
+
+
+if __name__ == "__main__":
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    total = run(seed=seed) + run(seed=seed + 1, use_sync=True)
+    print(f"✅ Move generator matched the rescans on {total} positions (seed {seed}).")
@@ -0,0 +1,294 @@
+from deck import SUITS, SUIT_NAMES, RANKS
+from card_rules import FACE
+
+# 🃏 One card = one byte
+#   bits 0-3  rank index (0 = a ... 12 = k)
+#   bits 4-5  suit index into SUITS (♠ ♥ ♦ ♣)
+#   bit  6    color (set = red)
+#   bit  7    owner (set = blue deck)
+RANK_MASK = 0x0F
+SUIT_SHIFT = 4
+SUIT_MASK = 0x30
+COLOR_BIT = 0x40
+OWNER_BIT = 0x80
+NO_CARD = 0xFF  # rank 15 never occurs, so this can't collide with a real card
+
+OWNERS = ['red', 'blue']
+RED_SUITS = ['♥', '♦']
+
+# Pile ids: every pile on the board lives in Board.piles at a fixed index
+P1_CRAPETTE, P1_TALON, P1_WASTE = 0, 1, 2
+P2_CRAPETTE, P2_TALON, P2_WASTE = 3, 4, 5
+FOUNDATION_LEFT = 6     # 6..9, one per FOUNDATION_SUITS entry
+FOUNDATION_RIGHT = 10   # 10..13
+TABLEAU_LEFT = 14       # 14..17
+TABLEAU_RIGHT = 18      # 18..21
+PILE_COUNT = 22
+# Move ops may also name the revealed talon card slots: PILE_COUNT + player
+REVEALED_P1, REVEALED_P2 = PILE_COUNT, PILE_COUNT + 1
+
+FOUNDATIONS = range(FOUNDATION_LEFT, TABLEAU_LEFT)
+TABLEAUS = range(TABLEAU_LEFT, PILE_COUNT)
+
+
+def crapette_of(player):
+    return 3 * player
+
+
+def talon_of(player):
+    return 3 * player + 1
+
+
+def waste_of(player):
+    return 3 * player + 2
+
+
+def revealed_of(player):
+    return PILE_COUNT + player
+
+
+# 🔑 Zobrist keys per (pile, height, card), derived with splitmix64 on first use
+# rather than generated as a big random table at import
+MASK64 = (1 << 64) - 1
+TURN_KEY = 0x5DEECE66DF00D5A1
+TURN_OP = 0x3FF  # undo-log entry for a turn switch; moves are src << 5 | dst (< 0x300)
+ZOBRIST = {}
+
+
+def zobrist_key(pile_id, height, code):
+    index = pile_id << 16 | height << 8 | code
+    key = ZOBRIST.get(index)
+    if key is None:
+        x = (index * 0x9E3779B97F4A7C15) & MASK64
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+        key = ZOBRIST[index] = x ^ (x >> 31)
+    return key
+
+
+def encode(rank, suit, owner):
+    code = RANKS.index(rank) | (SUITS.index(suit) << SUIT_SHIFT)
+    if suit in RED_SUITS:
+        code |= COLOR_BIT
+    if owner == 'blue':
+        code |= OWNER_BIT
+    return code
+
+
+# Both directions are table lookups; building them once keeps conversion cheap
+CODE_BY_ID = {}
+CARD_FIELDS = {}
+for _owner in OWNERS:
+    for _rank in RANKS:
+        for _suit in SUITS:
+            _code = encode(_rank, _suit, _owner)
+            CODE_BY_ID[f"{_owner}_{SUIT_NAMES[_suit]}_{_rank}"] = _code
+            CARD_FIELDS[_code] = (_rank, _suit, _owner)
+ALL_CODES = sorted(CARD_FIELDS)
+
+
+def encode_card(card):
+    return CODE_BY_ID[card['id']]
+
+
+def decode_card(code):
+    # Same shape as deck.create_deck builds
+    rank, suit, owner = CARD_FIELDS[code]
+    return {
+        'id': f"{owner}_{SUIT_NAMES[suit]}_{rank}",
+        'rank': rank,
+        'suit': suit,
+        'color': 'red' if code & COLOR_BIT else 'black',
+        'suit_name': SUIT_NAMES[suit],
+        'owner': owner,
+        'face': FACE[rank + suit]
+    }
+
+
+def rank_of(code):
+    return code & RANK_MASK
+
+
+def suit_of(code):
+    return (code & SUIT_MASK) >> SUIT_SHIFT
+
+
+def is_red(code):
+    return bool(code & COLOR_BIT)
+
+
+def owner_of(code):
+    return OWNERS[code >> 7]
+
+
+def card_name(code):
+    rank, suit, _ = CARD_FIELDS[code]
+    return f"{rank}{suit}"
+
+
+# Same rules as ui_helpers, on codes: only masks and compares, no list lookups
+def can_play_on_foundation(code, pile):
+    if not pile:
+        return code & RANK_MASK == 0
+    top = pile[-1]
+    return (top ^ code) & SUIT_MASK == 0 and code & RANK_MASK == (top & RANK_MASK) + 1
+
+
+def can_play_on_tableau(code, target):
+    return code & RANK_MASK == (target & RANK_MASK) - 1 and bool((code ^ target) & COLOR_BIT)
+
+
+def can_play_on_crapette(code, target):
+    return (code ^ target) & SUIT_MASK == 0 and abs((code & RANK_MASK) - (target & RANK_MASK)) == 1
+
+
+can_play_on_opponent_crapette = can_play_on_crapette
+
+
+class Board:
+    """
+    The whole position in a handful of bytearrays. piles[pile_id] holds card
+    codes bottom to top; revealed[player] is the face-up talon card or NO_CARD.
+
+    Every change goes through move()/switch_turn(), which keep a Zobrist hash
+    up to date and append one int to an undo log, so a position can be rolled
+    back in O(1) per move and compared by hash without copying anything.
+    """
+    __slots__ = ('piles', 'revealed', 'turn', 'hash', 'history')
+
+    def __init__(self):
+        self.piles = [bytearray() for _ in range(PILE_COUNT)]
+        self.revealed = bytearray([NO_CARD, NO_CARD])
+        self.turn = 0
+        self.hash = 0
+        self.history = []
+
+    @classmethod
+    def from_piles(cls, player1, player2, foundation_left, foundation_right, tableau_left, tableau_right, current_turn="Player 1"):
+        board = cls()
+        piles = board.piles
+        for player, p in ((player1, 0), (player2, 1)):
+            piles[crapette_of(p)][:] = bytes(CODE_BY_ID[c['id']] for c in player['crapette'])
+            piles[talon_of(p)][:] = bytes(CODE_BY_ID[c['id']] for c in player['talon'])
+            piles[waste_of(p)][:] = bytes(CODE_BY_ID[c['id']] for c in player['waste'])
+            if player.get('revealed'):
+                board.revealed[p] = CODE_BY_ID[player['revealed']['id']]
+        for base, side in ((FOUNDATION_LEFT, foundation_left), (FOUNDATION_RIGHT, foundation_right),
+                           (TABLEAU_LEFT, tableau_left), (TABLEAU_RIGHT, tableau_right)):
+            for i, pile in enumerate(side):
+                piles[base + i][:] = bytes(CODE_BY_ID[c['id']] for c in pile)
+        board.turn = 0 if current_turn == "Player 1" else 1
+        board.rehash()
+        return board
+
+    def to_piles(self, cards=None):
+        """
+        Back to the dict form used by the pygame frontend. Pass the cards the
+        frontend already holds ({code: dict}) to get the same objects back, so
+        identity checks like `selected_card is top` keep working.
+        """
+        if cards is None:
+            cards = {code: decode_card(code) for code in ALL_CODES}
+        piles = [[cards[code] for code in pile] for pile in self.piles]
+
+        players = []
+        for p in (0, 1):
+            player = {'crapette': piles[crapette_of(p)], 'talon': piles[talon_of(p)], 'waste': piles[waste_of(p)]}
+            if self.revealed[p] != NO_CARD:
+                player['revealed'] = cards[self.revealed[p]]
+            players.append(player)
+
+        foundation_left = piles[FOUNDATION_LEFT:FOUNDATION_LEFT + 4]
+        foundation_right = piles[FOUNDATION_RIGHT:FOUNDATION_RIGHT + 4]
+        tableau_left = piles[TABLEAU_LEFT:TABLEAU_LEFT + 4]
+        tableau_right = piles[TABLEAU_RIGHT:TABLEAU_RIGHT + 4]
+        return players[0], players[1], foundation_left, foundation_right, tableau_left, tableau_right
+
+    @property
+    def current_turn(self):
+        return "Player 1" if self.turn == 0 else "Player 2"
+
+    def rehash(self):
+        """Full recomputation; only needed after filling piles by hand."""
+        h = TURN_KEY if self.turn else 0
+        for pile_id, pile in enumerate(self.piles):
+            for height, code in enumerate(pile):
+                h ^= zobrist_key(pile_id, height, code)
+        for p in (0, 1):
+            if self.revealed[p] != NO_CARD:
+                h ^= zobrist_key(PILE_COUNT + p, 0, self.revealed[p])
+        self.hash = h
+        return h
+
+    def copy(self):
+        # A copy starts with an empty undo log: it is a new root position
+        board = Board.__new__(Board)
+        board.piles = [bytearray(pile) for pile in self.piles]
+        board.revealed = bytearray(self.revealed)
+        board.turn = self.turn
+        board.hash = self.hash
+        board.history = []
+        return board
+
+    def top(self, pile_id):
+        if pile_id >= PILE_COUNT:
+            return self.revealed[pile_id - PILE_COUNT]
+        pile = self.piles[pile_id]
+        return pile[-1] if pile else NO_CARD
+
+    def shift(self, src, dst):
+        # Top card of src onto dst, hash kept in step; src/dst may be revealed slots
+        if src >= PILE_COUNT:
+            code = self.revealed[src - PILE_COUNT]
+            self.revealed[src - PILE_COUNT] = NO_CARD
+            h = self.hash ^ zobrist_key(src, 0, code)
+        else:
+            pile = self.piles[src]
+            code = pile.pop()
+            h = self.hash ^ zobrist_key(src, len(pile), code)
+        if dst >= PILE_COUNT:
+            self.revealed[dst - PILE_COUNT] = code
+            h ^= zobrist_key(dst, 0, code)
+        else:
+            target = self.piles[dst]
+            h ^= zobrist_key(dst, len(target), code)
+            target.append(code)
+        self.hash = h
+        return code
+
+    def move(self, src, dst):
+        code = self.shift(src, dst)
+        self.history.append(src << 5 | dst)
+        return code
+
+    def switch_turn(self):
+        self.turn = 1 - self.turn
+        self.hash ^= TURN_KEY
+        self.history.append(TURN_OP)
+
+    def undo(self):
+        op = self.history.pop()
+        if op == TURN_OP:
+            self.turn = 1 - self.turn
+            self.hash ^= TURN_KEY
+        else:
+            self.shift(op & 31, op >> 5)
+
+    def mark(self):
+        """A cheap snapshot: just the undo-log position to rollback() to."""
+        return len(self.history)
+
+    def rollback(self, mark):
+        while len(self.history) > mark:
+            self.undo()
+
+    def __eq__(self, other):
+        return (isinstance(other, Board) and self.hash == other.hash and self.turn == other.turn and
+                self.revealed == other.revealed and self.piles == other.piles)
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        sizes = ' '.join(str(len(pile)) for pile in self.piles)
+        return f"<Board {self.current_turn} piles=[{sizes}] hash={self.hash:016x}>"
@@ -0,0 +1,287 @@
+import os
+import random
+import sys
+import time
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+
+from deck import RANKS, SUITS
+from compact_state import (
+    Board, encode, NO_CARD, RANK_MASK, SUIT_MASK, SUIT_SHIFT, COLOR_BIT,
+    FOUNDATION_LEFT, FOUNDATION_RIGHT, TABLEAU_LEFT, TABLEAU_RIGHT, PILE_COUNT,
+    crapette_of, talon_of, waste_of, revealed_of,
+)
+from card_ledger import CHECK_CARDS, board_ledger
+
+# 🎬 Actions are small ints so policies, logs and replays can pass them around cheaply:
+#   src << 5 | dst  moves the top card of pile src onto pile dst
+#   src may be revealed_of(player), the player's revealed talon card
+DRAW_TALON = 0x3FE
+END_TURN = 0x3FF
+
+# Foundation slot i only takes FOUNDATION_SUITS[i] (same layout as the pygame board)
+FOUNDATION_SUITS = ['♥', '♠', '♣', '♦']
+FOUNDATION_SLOT = [FOUNDATION_SUITS.index(suit) for suit in SUITS]  # indexed by suit bits
+TABLEAU_PILES = list(range(TABLEAU_LEFT, TABLEAU_LEFT + 4)) + list(range(TABLEAU_RIGHT, TABLEAU_RIGHT + 4))
+TABLEAU_SET = frozenset(TABLEAU_PILES)
+
+
+def make_move(src, dst):
+    return src << 5 | dst
+
+
+def split_move(action):
+    return action >> 5, action & 31
+
+
+def describe_action(action):
+    if action == DRAW_TALON:
+        return "draw talon"
+    if action == END_TURN:
+        return "end turn"
+    src, dst = split_move(action)
+    return f"move {'revealed' if src >= PILE_COUNT else src} -> {dst}"
+
+
+def deal_board(rng=random):
+    """Same layout as deck.deal_cards, straight into a Board and without the debug scans."""
+    board = Board()
+    piles = board.piles
+    for p, owner in ((0, 'red'), (1, 'blue')):
+        cards = [encode(r, s, owner) for r in RANKS for s in SUITS]
+        rng.shuffle(cards)
+        base = TABLEAU_LEFT if p == 0 else TABLEAU_RIGHT
+        for i in range(4):
+            piles[base + i].append(cards.pop())
+        piles[crapette_of(p)][:] = bytes(cards.pop() for _ in range(13))
+        piles[talon_of(p)][:] = bytes(cards)
+    board.rehash()
+    return board
+
+
+def random_policy(rng=None):
+    rng = rng or random.Random()
+    choice = rng.choice
+
+    def policy(engine, actions):
+        return choice(actions)
+    return policy
+
+
+class CrapetteEngine:
+    """
+    Headless rules engine: no pygame, one Board, integer actions.
+
+    A turn is any number of card moves by the current player, then END_TURN.
+    The talon card may only be turned (DRAW_TALON) when no card can move at
+    all, as in the UI (has_any_valid_move must be false). At END_TURN the
+    revealed card, or the talon top if there is none, goes to the player's
+    waste; finalize_turn in the centerplay UI follows the same rule. A player
+    wins by emptying crapette, talon, waste and revealed card. Two turns in a
+    row without any card movement, or max_turns, end the game without a winner.
+
+    check_cards (default: CRAPETTE_CHECK_CARDS) checks every apply()/undo()
+    against a CardLedger and raises CardConservationError on a lost or
+    duplicated card.
+    """
+
+    def __init__(self, board, max_turns=1000, max_moves_per_turn=60, recycle_waste=False, check_cards=CHECK_CARDS):
+        self.board = board
+        self.max_turns = max_turns
+        self.max_moves_per_turn = max_moves_per_turn
+        self.recycle_waste = recycle_waste  # variant: flip the waste back into an empty talon
+        self.turns = 0
+        self.actions_played = 0
+        self.moves_this_turn = 0
+        self.idle_turns = 0
+        self.winner = None
+        self.over = False
+        self.history = []  # per action: board undo mark + the counters it changed
+        self.ledger = board_ledger(board) if check_cards else None
+
+    @classmethod
+    def from_deal(cls, state, current_turn="Player 1", **rules):
+        """Start from deal_cards()-style piles (player1, player2, foundations, tableaus)."""
+        return cls(Board.from_piles(*state, current_turn=current_turn), **rules)
+
+    @classmethod
+    def new_game(cls, rng=random, **rules):
+        return cls(deal_board(rng), **rules)
+
+    @property
+    def turn(self):
+        return self.board.turn
+
+    def targets(self, p):
+        """
+        Everything a card could land on this decision, indexed so each source
+        card costs a few dict lookups instead of a scan over all piles.
+        """
+        piles = self.board.piles
+        by_top = {}      # (rank, color bit) of a tableau top -> piles with that top
+        empty = []
+        for dst in TABLEAU_PILES:
+            target = piles[dst]
+            if target:
+                top = target[-1]
+                by_top.setdefault((top & RANK_MASK, top & COLOR_BIT), []).append(dst)
+            else:
+                empty.append(dst)
+        opponent_crapette = piles[crapette_of(1 - p)]
+        opponent_waste = piles[waste_of(1 - p)]
+        return (
+            by_top, empty,
+            opponent_crapette[-1] if opponent_crapette else NO_CARD,
+            opponent_waste[-1] if opponent_waste else NO_CARD,
+        )
+
+    def destinations(self, code, p, src, targets=None):
+        piles = self.board.piles
+        by_top, empty, opponent_crapette, opponent_waste = targets or self.targets(p)
+        rank = code & RANK_MASK
+        found = []
+
+        slot = FOUNDATION_SLOT[(code & SUIT_MASK) >> SUIT_SHIFT]
+        if len(piles[FOUNDATION_LEFT + slot]) == rank:
+            found.append(FOUNDATION_LEFT + slot)
+        if len(piles[FOUNDATION_RIGHT + slot]) == rank:
+            found.append(FOUNDATION_RIGHT + slot)
+
+        on_top = by_top.get((rank + 1, (code & COLOR_BIT) ^ COLOR_BIT))
+        if on_top:
+            found += on_top
+        # Moving a lone tableau card to another empty slot changes nothing
+        if empty and not (src in TABLEAU_SET and len(piles[src]) == 1):
+            found += empty
+
+        if opponent_crapette != NO_CARD:
+            if (opponent_crapette ^ code) & SUIT_MASK == 0 and abs((opponent_crapette & RANK_MASK) - rank) == 1:
+                found.append(crapette_of(1 - p))
+        if opponent_waste != NO_CARD:
+            if (opponent_waste ^ code) & COLOR_BIT and abs((opponent_waste & RANK_MASK) - rank) == 1:
+                found.append(waste_of(1 - p))
+        return found
+
+    def crapette_playable(self, p=None):
+        p = self.board.turn if p is None else p
+        crapette = self.board.piles[crapette_of(p)]
+        return bool(crapette) and bool(self.destinations(crapette[-1], p, crapette_of(p)))
+
+    def legal_actions(self):
+        if self.over:
+            return []
+        actions = [END_TURN]
+        if self.moves_this_turn >= self.max_moves_per_turn:
+            return actions
+
+        board = self.board
+        piles = board.piles
+        p = board.turn
+        targets = self.targets(p)
+        destinations = self.destinations
+
+        for src in (crapette_of(p), waste_of(p), *TABLEAU_PILES):
+            pile = piles[src]
+            if pile:
+                for dst in destinations(pile[-1], p, src, targets):
+                    actions.append(src << 5 | dst)
+
+        revealed = board.revealed[p]
+        if revealed != NO_CARD:
+            src = revealed_of(p)
+            for dst in destinations(revealed, p, src, targets):
+                actions.append(src << 5 | dst)
+        elif piles[talon_of(p)] and len(actions) == 1:
+            actions.append(DRAW_TALON)  # nothing but END_TURN so far: no card can move
+        return actions
+
+    def apply(self, action):
+        board = self.board
+        piles = board.piles
+        p = board.turn
+        self.history.append((board.mark(), self.moves_this_turn, self.idle_turns, self.turns, self.winner, self.over))
+        self.actions_played += 1
+
+        if action == END_TURN:
+            self.end_turn()
+        elif action == DRAW_TALON:
+            board.move(talon_of(p), revealed_of(p))
+            self.moves_this_turn += 1
+        else:
+            board.move(action >> 5, action & 31)
+            self.moves_this_turn += 1
+            if (not piles[crapette_of(p)] and not piles[talon_of(p)] and not piles[waste_of(p)]
+                    and board.revealed[p] == NO_CARD):
+                self.winner = p
+                self.over = True
+
+        if self.ledger:
+            self.ledger.check()
+
+    def undo(self):
+        """Take back the last apply(), board and counters alike."""
+        mark, self.moves_this_turn, self.idle_turns, self.turns, self.winner, self.over = self.history.pop()
+        self.board.rollback(mark)
+        self.actions_played -= 1
+        if self.ledger:
+            self.ledger.check()
+
+    def end_turn(self):
+        board = self.board
+        piles = board.piles
+        p = board.turn
+        moved = self.moves_this_turn > 0
+
+        if board.revealed[p] != NO_CARD:
+            board.move(revealed_of(p), waste_of(p))
+            moved = True
+        elif piles[talon_of(p)]:
+            board.move(talon_of(p), waste_of(p))
+            moved = True
+        elif self.recycle_waste and piles[waste_of(p)]:
+            # Card by card, so the talon comes out reversed and every step can be undone
+            while piles[waste_of(p)]:
+                board.move(waste_of(p), talon_of(p))
+            moved = True
+
+        self.idle_turns = 0 if moved else self.idle_turns + 1
+        self.moves_this_turn = 0
+        self.turns += 1
+        board.switch_turn()
+        if self.idle_turns >= 2 or self.turns >= self.max_turns:
+            self.over = True
+
+    def play(self, policies):
+        """Run to the end with policies[player](engine, actions) -> action."""
+        while not self.over:
+            actions = self.legal_actions()
+            self.apply(policies[self.board.turn](self, actions))
+        return self.result()
+
+    def result(self):
+        return {
+            'winner': self.winner,
+            'turns': self.turns,
+            'actions': self.actions_played,
+            'stalemate': self.over and self.winner is None,
+        }
+
+
+def benchmark(games=2000, seed=0, **rules):
+    rng = random.Random(seed)
+    policies = [random_policy(random.Random(seed + 1)), random_policy(random.Random(seed + 2))]
+    actions = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        engine = CrapetteEngine.new_game(rng, **rules)
+        actions += engine.play(policies)['actions']
+    elapsed = time.perf_counter() - start
+    return {'games': games, 'seconds': elapsed, 'games_per_sec': games / elapsed, 'actions_per_sec': actions / elapsed}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    stats = benchmark(count)
+    print(f"🎲 {stats['games']} random games in {stats['seconds']:.2f}s → "
+          f"{stats['games_per_sec']:.0f} games/s, {stats['actions_per_sec']:.0f} actions/s")
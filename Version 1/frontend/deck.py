@@ -0,0 +1,53 @@
+import random
+from collections import Counter
+
+from card_rules import FACE
+
+SUITS = ['♠', '♥', '♦', '♣']
+SUIT_NAMES = {'♠': 'spades', '♥': 'hearts', '♦': 'diamonds', '♣': 'clubs'}
+RANKS = ['a'] + [str(n) for n in range(2, 11)] + ['j', 'q', 'k']
+
+def create_deck(owner):
+    return [{
+        'id': f"{owner}_{SUIT_NAMES[s]}_{r.lower()}",  # e.g., red_diamonds_8
+        'rank': r.lower(),  # important: lowercase to match ranks
+        'suit': s,
+        'color': 'red' if s in ['♥', '♦'] else 'black',
+        'suit_name': SUIT_NAMES[s],
+        'owner': owner,  # 🆕 distinguish red vs blue decks
+        'face': FACE[r + s]  # 📐 row/column in the card_rules tables
+    } for r in RANKS for s in SUITS]
+
+def deal_cards(rng=None):
+    deck1 = create_deck("red")
+    duplicates1 = {x for x, count in Counter(card['id'] for card in deck1).items() if count > 1}
+    print(f"🔍 Duplicates in deck1 (red): {duplicates1}")
+    print(f"🧾 Red deck size: {len(deck1)}")  # Should be 52
+    
+    deck2 = create_deck("blue")
+    duplicates2 = {x for x, count in Counter(card['id'] for card in deck2).items() if count > 1}
+    print(f"🔍 Duplicates in deck2 (blue): {duplicates2}")
+    print(f"🧾 Blue deck size: {len(deck2)}")  # Should be 52
+    
+    # Pass a random.Random to make the deal reproducible from a seed
+    rng = rng or random
+    rng.shuffle(deck1)
+    rng.shuffle(deck2)
+    
+    def extract(deck, count): return [deck.pop() for _ in range(count)]
+    
+    # First extract tableau and crapette, then assign the rest as talon
+    tableau_left = [[extract(deck1, 1)[0]] for _ in range(4)]
+    tableau_right = [[extract(deck2, 1)[0]] for _ in range(4)]
+
+    crapette1 = extract(deck1, 13)
+    crapette2 = extract(deck2, 13)
+
+     # Reveal top card of talon without moving to waste
+    p1 = {'crapette': crapette1, 'talon': deck1, 'waste': []}
+    p2 = {'crapette': crapette2, 'talon': deck2, 'waste': []}
+
+    foundation_left = [[] for _ in range(4)]
+    foundation_right = [[] for _ in range(4)]
+
+    return p1, p2, foundation_left, foundation_right, tableau_left, tableau_right
@@ -0,0 +1,237 @@
+import atexit
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+# 📜 Structured event log for the UI. Logging a move or a click only stores a
+# tuple in a ring buffer: no formatting, no I/O. A background thread formats
+# what's new every FLUSH_INTERVAL and writes it out:
+#   console   the same emoji lines the game used to print (CRAPETTE_LOG_ECHO=0 turns it off)
+#   file      CRAPETTE_LOG=events.jsonl appends one JSON object per record
+# CRAPETTE_LOG_LEVEL=debug|info|warn|error|off filters at the call site:
+# a disabled level is bound to a no-op, so it costs one empty call.
+#
+# The ring keeps the last RING_SIZE records whatever got flushed, so after a
+# crash LOG.tail() / LOG.query() still show what led up to it, and the file
+# can be searched with read_log() or `python event_log.py events.jsonl`.
+DEBUG, INFO, WARN, ERROR, OFF = 10, 20, 30, 40, 100
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARN: 'warn', ERROR: 'error', OFF: 'off'}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+RING_SIZE = 4096
+FLUSH_INTERVAL = 0.1  # seconds
+
+# What each event reads like on the console; fields are str.format()ted in lazily
+MESSAGES = {
+    'deal': "🎲 Deal seed: {seed}",
+    'select': "🟢 Selected {card[rank]} of {card[suit_name]}",
+    'deselect': "🟢 Deselected {reason}",
+    'selection': "DEBUG → new: {new}, selected: {selected}, is same object: {same}",
+    'reveal': "🃏 {player} revealed {card[rank]} of {card[suit_name]}",
+    'draw': "🃏 {player} drew {card[rank]} of {card[suit_name]}",
+    'talon_blocked': "❌ {reason}",
+    'to_waste': "📥 {player} moves {card[rank]} of {card[suit_name]} to discard pile.",
+    'auto_waste': "♻️ {player} auto-moved {card[rank]} of {card[suit_name]} to waste",
+    'talon_empty': "🕳️ {player}'s talon is empty.",
+    'turn': "🔁 Turn changes to {player}",
+    'play_on_waste': "🔁 Played {card[rank]} on opponent's discard pile",
+    'crapette_claim': "🛑 Crapette claimed! (Check logic here)",
+    'hint': "🧠 Hint: {text} (depth {depth}, {nodes_per_sec:.0f} nodes/s)",
+    'overlay': "📊 Frame profiler overlay {state}",
+    'crash': "🚨 An error occurred: {error}",
+    'bot_move': "🤖 {player} decided to {action} in {think_ms} ms",
+    'bot_play': "🤖 {player} plays {card[rank]} of {card[suit_name]} to {pile} (thought {think_ms} ms)",
+}
+
+
+def _off(event, **fields):
+    pass
+
+
+def format_record(record):
+    _, _, _, event, fields = record
+    template = MESSAGES.get(event)
+    if template is not None:
+        try:
+            return template.format(**fields)
+        except (KeyError, IndexError, TypeError, ValueError):
+            pass
+    return f"{event} {fields}" if fields else event
+
+
+def record_json(record):
+    seq, stamp, level, event, fields = record
+    return json.dumps({'seq': seq, 'time': round(stamp, 6), 'level': LEVEL_NAMES.get(level, level),
+                       'event': event, 'message': format_record(record), **fields},
+                      ensure_ascii=False, default=str)
+
+
+class EventLog:
+    """
+    Records are (seq, time, level, event, fields) tuples in a fixed ring. A
+    log call only takes a number from an atomic counter, writes its slot and
+    bumps seq; the flusher reads slots it hasn't seen yet, so nobody takes a
+    lock. If the flusher ever falls a whole ring behind, the overwritten
+    records are counted in `dropped`.
+    """
+
+    def __init__(self, level=INFO, path=None, echo=True, size=RING_SIZE, interval=FLUSH_INTERVAL):
+        self.size = size
+        self.ring = [None] * size
+        self.numbers = itertools.count()
+        self.seq = 0            # records logged so far; the next one goes in ring[seq % size]
+        self.flushed = 0        # records handed to the sinks so far
+        self.dropped = 0
+        self.path = path
+        self.echo = echo
+        self.interval = interval
+        self.file = None
+        self.thread = None
+        self.wake = threading.Event()
+        self.stopping = False
+        self.drain_lock = threading.Lock()  # flusher vs an explicit flush(), never the UI's log calls
+        self.set_level(level)
+
+    @classmethod
+    def from_env(cls):
+        level = os.environ.get('CRAPETTE_LOG_LEVEL', 'info').lower()
+        return cls(level=LEVELS.get(level, INFO), path=os.environ.get('CRAPETTE_LOG'),
+                   echo=os.environ.get('CRAPETTE_LOG_ECHO', '1') != '0')
+
+    def set_level(self, level):
+        self.level = level
+        for name, threshold in (('debug', DEBUG), ('info', INFO), ('warn', WARN), ('error', ERROR)):
+            setattr(self, name, self._emitter(threshold) if threshold >= level else _off)
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def _emitter(self, level):
+        def emit(event, **fields):
+            self.log(level, event, fields)
+        return emit
+
+    def log(self, level, event, fields):
+        seq = next(self.numbers)  # atomic, so a second thread (the bot) can log too
+        self.ring[seq % self.size] = (seq, time.time(), level, event, fields)
+        if seq >= self.seq:
+            self.seq = seq + 1
+        if self.thread is None:
+            if self.echo or self.path:
+                self._start()
+        elif seq - self.flushed > self.size >> 1:
+            self.wake.set()  # a burst: don't wait for the next tick before the ring laps
+
+    # 🧵 Background flushing
+
+    def _start(self):
+        self.thread = threading.Thread(target=self._run, name="event-log-flusher", daemon=True)
+        self.thread.start()
+        atexit.unregister(self.close)
+        atexit.register(self.close)
+
+    def _run(self):
+        while not self.stopping:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            self.drain()
+
+    def pending(self):
+        """Records logged but not flushed yet, oldest first, and the seq to resume from."""
+        seq = self.seq
+        start = max(self.flushed, seq - self.size)
+        self.dropped += start - self.flushed
+        records = []
+        for n in range(start, seq):
+            record = self.ring[n % self.size]
+            if record is None or record[0] < n:
+                return records, n       # numbered but not written yet: pick it up next time
+            if record[0] == n:
+                records.append(record)
+            else:
+                self.dropped += 1       # lapped while we were reading
+        return records, seq
+
+    def drain(self):
+        with self.drain_lock:
+            records, seq = self.pending()
+            self.flushed = seq
+            if not records:
+                return 0
+            if self.echo:
+                sys.stdout.write(''.join(format_record(record) + "\n" for record in records))
+                sys.stdout.flush()
+            if self.path:
+                if self.file is None:
+                    self.file = open(self.path, 'a', encoding='utf-8')
+                self.file.write(''.join(record_json(record) + "\n" for record in records))
+                self.file.flush()
+            return len(records)
+
+    def flush(self):
+        """Write out everything logged so far, from the calling thread."""
+        return self.drain()
+
+    def close(self):
+        self.stopping = True
+        self.wake.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(1.0)
+        self.drain()
+        self.thread, self.stopping = None, False  # logging again starts a new flusher
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    # 🔎 Looking back
+
+    def records(self):
+        """Everything still in the ring, oldest first."""
+        seq = self.seq
+        found = (self.ring[n % self.size] for n in range(max(0, seq - self.size), seq))
+        return [record for record in found if record is not None]
+
+    def query(self, level=DEBUG, event=None, since=0.0, **fields):
+        """Records at or above level, optionally of one event, after a time, with matching field values."""
+        return [record for record in self.records()
+                if record[2] >= level and (event is None or record[3] == event) and record[1] >= since
+                and all(record[4].get(key) == value for key, value in fields.items())]
+
+    def tail(self, n=20):
+        return [format_record(record) for record in self.records()[-n:]]
+
+    def stats(self):
+        return {'level': LEVEL_NAMES.get(self.level, self.level), 'logged': self.seq, 'flushed': self.flushed,
+                'dropped': self.dropped, 'in_ring': min(self.seq, self.size)}
+
+
+def read_log(path, level=DEBUG, event=None):
+    """Records back from a CRAPETTE_LOG file, as dicts, filtered like EventLog.query()."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+            if LEVELS.get(record.get('level'), 0) >= level and (event is None or record.get('event') == event):
+                yield record
+
+
+# The one log the UI modules share
+LOG = EventLog.from_env()
+
+
+if __name__ == "__main__":
+    # python event_log.py events.jsonl [level] [event] [last N]
+    path = sys.argv[1] if len(sys.argv) > 1 else 'events.jsonl'
+    level = LEVELS.get(sys.argv[2].lower(), DEBUG) if len(sys.argv) > 2 else DEBUG
+    event = sys.argv[3] if len(sys.argv) > 3 and sys.argv[3] != '-' else None
+    last = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+    found = list(read_log(path, level, event))
+    for record in found[-last:]:
+        stamp = time.strftime('%H:%M:%S', time.localtime(record['time']))
+        print(f"{stamp} {record['level']:5} #{record['seq']:<6} {record['message']}")
+    print(f"📜 {len(found)} matching records in {path}")
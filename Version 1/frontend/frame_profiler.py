@@ -0,0 +1,198 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+# 📊 Per-phase frame timings. Wrap each part of the main loop in
+# `with profiler.phase('draw'):`; with the profiler off that is a shared no-op
+# context and begin_frame()/end_frame() return straight away.
+PHASES = ('events', 'rules', 'draw', 'display')
+OVERLAY_REFRESH = 0.5  # seconds between overlay repaints
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ('samples', 'start')
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.samples:  # empty only when switched on mid-frame
+            self.samples[-1] += time.perf_counter() - self.start
+        return False
+
+
+def percentile(ordered, q):
+    # Nearest rank on an already sorted list
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class FrameProfiler:
+    """
+    Rolling frame and phase timings over the last `window` frames.
+
+    A frame is the busy part of one loop iteration, from begin_frame() to
+    end_frame(); the clock.tick() sleep is left out. A phase entered several
+    times in a frame adds up, and nested phases (rules inside events) are
+    counted in both.
+
+    dump_path gets a summary every dump_every seconds: one row per series
+    appended to a .csv file, or one JSON object per line for anything else.
+    """
+
+    def __init__(self, enabled=False, window=600, dump_path=None, dump_every=5.0, phases=PHASES):
+        self.enabled = enabled
+        self.overlay = False
+        self.window = window
+        self.dump_path = dump_path
+        self.dump_every = dump_every
+        self.frames = deque(maxlen=window)
+        self.phases = {name: _Phase(window) for name in phases}
+        self.frame_start = 0.0
+        self.last_dump = time.perf_counter()
+        self.last_overlay = 0.0
+        self.overlay_version = 0
+        self.overlay_lines = []
+        self.font = None
+
+    @classmethod
+    def from_env(cls):
+        """CRAPETTE_PROFILE=1 turns it on at start, CRAPETTE_PROFILE_DUMP=path adds dumps."""
+        dump_path = os.environ.get('CRAPETTE_PROFILE_DUMP')
+        return cls(enabled=bool(os.environ.get('CRAPETTE_PROFILE') or dump_path), dump_path=dump_path)
+
+    def phase(self, name):
+        if not self.enabled:
+            return NULL_PHASE
+        return self.phases[name]
+
+    def start(self, name):
+        # For phases that would need a whole block re-indented under `with`
+        if self.enabled:
+            self.phases[name].__enter__()
+
+    def stop(self, name):
+        if self.enabled:
+            self.phases[name].__exit__()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        for phase in self.phases.values():
+            phase.samples.append(0.0)
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or not self.frame_start:
+            return
+        now = time.perf_counter()
+        self.frames.append(now - self.frame_start)
+        self.frame_start = 0.0
+        if self.dump_path and now - self.last_dump >= self.dump_every:
+            self.dump()
+            self.last_dump = now
+
+    def toggle_overlay(self):
+        # The overlay needs numbers, so showing it switches collection on (and keeps it on)
+        self.overlay = not self.overlay
+        if self.overlay and not self.enabled:
+            self.enabled = True
+            self.reset()
+        self.last_overlay = 0.0
+        return self.overlay
+
+    def reset(self):
+        self.frames.clear()
+        for phase in self.phases.values():
+            phase.samples.clear()
+
+    def summary(self):
+        """{series: {count, mean, p50, p95, p99, max}} in milliseconds, for 'frame' and every phase."""
+        series = {'frame': self.frames}
+        series.update((name, phase.samples) for name, phase in self.phases.items())
+        stats = {}
+        for name, samples in series.items():
+            ordered = sorted(samples)
+            stats[name] = {
+                'count': len(ordered),
+                'mean': 1000 * sum(ordered) / len(ordered) if ordered else 0.0,
+                'p50': 1000 * percentile(ordered, 0.50),
+                'p95': 1000 * percentile(ordered, 0.95),
+                'p99': 1000 * percentile(ordered, 0.99),
+                'max': 1000 * ordered[-1] if ordered else 0.0,
+            }
+        return stats
+
+    def dump(self, path=None):
+        path = path or self.dump_path
+        stats = self.summary()
+        stamp = time.time()
+        if path.endswith('.csv'):
+            new_file = not os.path.exists(path)
+            with open(path, 'a', newline='') as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(['time', 'series', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+                for name, s in stats.items():
+                    writer.writerow([f"{stamp:.3f}", name, s['count']] +
+                                    [f"{s[k]:.3f}" for k in ('mean', 'p50', 'p95', 'p99', 'max')])
+        else:
+            with open(path, 'a') as f:
+                f.write(json.dumps({'time': stamp, 'window': self.window, 'series': stats}) + "\n")
+
+    # 🖥️ F3 overlay: a DirtyRenderer region that only changes every OVERLAY_REFRESH seconds
+
+    def overlay_due(self):
+        if not self.overlay:
+            return False
+        now = time.perf_counter()
+        if now - self.last_overlay < OVERLAY_REFRESH:
+            return False
+        self.last_overlay = now
+        stats = self.summary()
+        self.overlay_lines = [f"{'':8}{'p50':>7}{'p95':>7}{'p99':>7}  ms"] + [
+            f"{name:8}{s['p50']:7.2f}{s['p95']:7.2f}{s['p99']:7.2f}" for name, s in stats.items()
+        ]
+        self.overlay_version += 1
+        return True
+
+    def region(self, screen):
+        if not self.overlay:
+            return 'profiler', None, lambda: pygame.Rect(screen.get_width() - 10, 10, 0, 0)
+        return 'profiler', self.overlay_version, lambda: self.draw_overlay(screen)
+
+    def draw_overlay(self, screen):
+        if self.font is None:
+            # Columns only line up in a monospace font
+            self.font = pygame.font.SysFont("consolas,couriernew,dejavusansmono,monospace", 15)
+        surfaces = [self.font.render(line, True, (255, 255, 255)) for line in self.overlay_lines]
+        width = max((s.get_width() for s in surfaces), default=0) + 16
+        height = sum(s.get_height() for s in surfaces) + 12
+        box = pygame.Rect(screen.get_width() - width - 10, 10, width, height)
+        screen.fill((20, 20, 20), box)
+        y = box.y + 6
+        for surface in surfaces:
+            screen.blit(surface, (box.x + 8, y))
+            y += surface.get_height()
+        return box
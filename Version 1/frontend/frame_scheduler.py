@@ -0,0 +1,84 @@
+import os
+import time
+
+import pygame
+
+# 💤 Main-loop pacing. A board waiting on a human has nothing to draw, so
+# instead of spinning clock.tick(60) the loop sleeps in pygame.event.wait()
+# until input arrives; only while something moves on its own (an animation,
+# a bot thinking/playing) does it fall back to a fixed frame rate.
+IDLE_TIMEOUT = 1.0  # seconds; idle loops still wake up this often
+
+
+class FrameScheduler:
+    """
+    Use in place of pygame.event.get() and clock.tick():
+
+        for event in scheduler.events(): ...
+        scheduler.wait()
+
+    wait() ticks at `fps` while busy (keep_awake() / busy_until in the future,
+    or `animating` set) and otherwise blocks until the next event. poll=True
+    (or CRAPETTE_POLL=1) restores the old fixed 60 FPS loop for comparison.
+    stats() reports how much CPU the process burnt while idle.
+    """
+
+    def __init__(self, fps=60, poll=None, idle_timeout=IDLE_TIMEOUT):
+        self.fps = fps
+        self.poll = bool(os.environ.get('CRAPETTE_POLL')) if poll is None else poll
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+        self.animating = False
+        self.busy_until = 0.0
+        self.pending = []
+        self.had_events = False
+        self.busy_frames = 0
+        self.idle_waits = 0
+        self.idle_wall = 0.0
+        self.idle_cpu = 0.0
+        self.started = time.perf_counter()
+        self.started_cpu = time.process_time()
+
+    def keep_awake(self, seconds):
+        """Run at the fixed frame rate for at least this long (e.g. an animation's duration)."""
+        self.busy_until = max(self.busy_until, time.perf_counter() + seconds)
+
+    @property
+    def busy(self):
+        return self.poll or self.animating or time.perf_counter() < self.busy_until
+
+    def events(self):
+        events = self.pending + pygame.event.get()
+        self.pending = []
+        self.had_events = bool(events)
+        return events
+
+    def wait(self, timeout=None):
+        """End of a loop iteration: tick if busy, otherwise sleep until input (or timeout seconds)."""
+        # Input was just handled: run one more frame so its result gets drawn before sleeping
+        if self.busy or self.had_events:
+            self.had_events = False
+            self.busy_frames += 1
+            self.clock.tick(self.fps)
+            return
+
+        timeout = self.idle_timeout if timeout is None else timeout
+        wall, cpu = time.perf_counter(), time.process_time()
+        event = pygame.event.wait(max(1, int(timeout * 1000)))
+        self.idle_wall += time.perf_counter() - wall
+        self.idle_cpu += time.process_time() - cpu
+        self.idle_waits += 1
+        if event.type != pygame.NOEVENT:
+            self.pending.append(event)
+
+    def stats(self):
+        wall = time.perf_counter() - self.started
+        cpu = time.process_time() - self.started_cpu
+        return {
+            'mode': 'poll' if self.poll else 'event',
+            'busy_frames': self.busy_frames,
+            'idle_waits': self.idle_waits,
+            'idle_seconds': round(self.idle_wall, 2),
+            'idle_cpu_percent': round(100 * self.idle_cpu / self.idle_wall, 2) if self.idle_wall else 0.0,
+            'cpu_percent': round(100 * cpu / wall, 2) if wall else 0.0,
+        }
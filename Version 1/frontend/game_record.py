@@ -0,0 +1,83 @@
+import os
+import sys
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+
+from card_ledger import BOARD_PILE_NAMES
+from compact_state import TURN_OP
+from record_format import RecordWriter, read_games, VARIANT_BOARD, FLAG_RECYCLE_WASTE
+
+# 📼 Board games in the shared record format (record_format.py): recording
+# CrapetteEngine self-play, replaying VARIANT_BOARD games, and the centerplay
+# hooks for logging a human game.
+
+# CRAPETTE_RECORD=games.crec: the pygame frontend appends every game it plays
+RECORD_PATH = os.environ.get('CRAPETTE_RECORD')
+BOARD_PILE_IDS = {name: i for i, name in enumerate(BOARD_PILE_NAMES)}
+
+
+def ledger_move(src, dst):
+    """Board op for a move reported by CardLedger.check() under ui_piles() names."""
+    return BOARD_PILE_IDS[src] << 5 | BOARD_PILE_IDS[dst]
+
+
+def replay_board(game):
+    """Rebuild the final Board of a VARIANT_BOARD game: no rule checks, just the recorded card moves."""
+    import random
+    from crapette_engine import deal_board
+
+    board = deal_board(random.Random(game.seed))
+    move, switch_turn = board.move, board.switch_turn
+    for op in game.moves:
+        if op == TURN_OP:
+            switch_turn()
+        else:
+            move(op >> 5, op & 31)
+    return board
+
+
+def play_recorded(writer, seed, policies, **rules):
+    """Play one CrapetteEngine game from seed, writing its board ops as they happen."""
+    import random
+    from crapette_engine import CrapetteEngine
+
+    engine = CrapetteEngine.new_game(random.Random(seed), **rules)
+    flags = FLAG_RECYCLE_WASTE if engine.recycle_waste else 0
+    writer.begin_game(seed, VARIANT_BOARD, flags, engine.max_turns, engine.max_moves_per_turn)
+    history = engine.board.history
+    written = 0
+    while not engine.over:
+        engine.apply(policies[engine.turn](engine, engine.legal_actions()))
+        writer.write_many(history[written:])
+        written = len(history)
+    writer.end_game(engine.winner, engine.turns)
+    return engine.result()
+
+
+if __name__ == "__main__":
+    # python game_record.py archive.crec [games] → record random self-play, then time a full replay
+    import random
+    import time
+    from crapette_engine import random_policy
+
+    path = sys.argv[1] if len(sys.argv) > 1 else 'games.crec'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    policies = [random_policy(random.Random(1)), random_policy(random.Random(2))]
+    start = time.perf_counter()
+    with RecordWriter(path) as writer:
+        first = writer.file.tell()
+        for seed in range(count):
+            play_recorded(writer, seed, policies)
+        size = writer.file.tell() - first
+    recorded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    replayed = moves = 0
+    for game in read_games(path):
+        board = replay_board(game)
+        moves += len(board.history)
+        replayed += 1
+    elapsed = time.perf_counter() - start
+    print(f"📼 {count} games, {size / count:.0f} bytes/game, recorded in {recorded:.2f}s; "
+          f"replayed {replayed} games in {elapsed:.2f}s ({moves / elapsed:.0f} moves/s)")
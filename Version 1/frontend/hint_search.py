@@ -0,0 +1,164 @@
+import time
+from collections import OrderedDict
+
+from compact_state import (
+    NO_CARD, PILE_COUNT, FOUNDATIONS, TABLEAU_RIGHT, TABLEAU_LEFT, FOUNDATION_LEFT, FOUNDATION_RIGHT,
+    crapette_of, talon_of, waste_of, card_name,
+)
+from crapette_engine import CrapetteEngine, DRAW_TALON, END_TURN, FOUNDATION_SUITS, TABLEAU_PILES
+
+def evaluate(board):
+    """Higher is better for the player to move: shed own cards, crapette first."""
+    piles = board.piles
+    p = board.turn
+    own = len(piles[crapette_of(p)]) + len(piles[talon_of(p)]) + len(piles[waste_of(p)])
+    if board.revealed[p] != NO_CARD:
+        own += 1
+    empty_tableaus = sum(1 for t in TABLEAU_PILES if not piles[t])
+    on_foundations = sum(len(piles[f]) for f in FOUNDATIONS)
+    return -10 * own - 4 * len(piles[crapette_of(p)]) + 3 * empty_tableaus + on_foundations
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class HintSearch:
+    """
+    Iterative-deepening search over the card moves available within the
+    current turn. Board keeps the Zobrist hash and undo log as moves are made
+    and taken back; a bounded LRU transposition
+    table remembers the best value found per position so revisits (tableau
+    shuffles reach the same board many ways) are not searched twice. The
+    search stops at the time budget and returns the best completed line.
+    """
+
+    def __init__(self, tt_size=200000, budget=0.03):
+        self.tt = OrderedDict()      # hash -> (depth, value, best action)
+        self.tt_size = tt_size
+        self.budget = budget
+        self.nodes = 0
+        self.tt_hits = 0
+
+    def search(self, board, budget=None, max_depth=12):
+        budget = self.budget if budget is None else budget
+        self.board = board.copy()
+        self.engine = CrapetteEngine(self.board, max_moves_per_turn=1 << 30)
+        self.deadline = time.perf_counter() + budget
+        self.nodes = 0
+        self.tt_hits = 0
+        self.path = set()
+        start = time.perf_counter()
+
+        best_line, best_value, depth_done = [], evaluate(self.board), 0
+        for depth in range(1, max_depth + 1):
+            try:
+                value, _ = self.search_node(depth)
+            except SearchTimeout:
+                break
+            best_value, depth_done = value, depth
+            best_line = self.principal_line(depth)
+            if len(best_line) < depth:
+                break  # the best line stops early: deeper searches can't change it
+
+        elapsed = time.perf_counter() - start
+        return {
+            'moves': best_line,
+            'score': best_value,
+            'depth': depth_done,
+            'nodes': self.nodes,
+            'elapsed': elapsed,
+            'nodes_per_sec': self.nodes / elapsed if elapsed else 0.0,
+            'tt_entries': len(self.tt),
+            'tt_hits': self.tt_hits,
+        }
+
+    def card_moves(self):
+        return [a for a in self.engine.legal_actions() if a != END_TURN and a != DRAW_TALON]
+
+    def search_node(self, depth):
+        self.nodes += 1
+        if self.nodes & 255 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        board = self.board
+        h = board.hash
+        entry = self.tt.get(h)
+        if entry is not None and entry[0] >= depth:
+            self.tt.move_to_end(h)
+            self.tt_hits += 1
+            return entry[1], entry[2]
+
+        # Stopping here is always allowed, so a position is worth at least its own evaluation
+        best, best_action = evaluate(board), None
+        if h in self.path:
+            return best, None  # back where this line started: don't cache a cycle-cut value
+        if depth > 0:
+            moves = self.card_moves()
+            if entry is not None and entry[2] in moves:
+                moves.remove(entry[2])
+                moves.insert(0, entry[2])
+            self.path.add(h)
+            try:
+                for action in moves:
+                    board.move(action >> 5, action & 31)
+                    try:
+                        value, _ = self.search_node(depth - 1)
+                    finally:
+                        board.undo()
+                    if value > best:
+                        best, best_action = value, action
+            finally:
+                self.path.discard(h)
+
+        self.store(h, depth, best, best_action)
+        return best, best_action
+
+    def store(self, h, depth, value, action):
+        tt = self.tt
+        tt[h] = (depth, value, action)
+        tt.move_to_end(h)
+        if len(tt) > self.tt_size:
+            tt.popitem(last=False)
+
+    def principal_line(self, depth):
+        board = self.board
+        mark = board.mark()
+        line, seen = [], set()
+        while len(line) < depth:
+            entry = self.tt.get(board.hash)
+            if entry is None or entry[2] is None or board.hash in seen:
+                break
+            seen.add(board.hash)
+            line.append(entry[2])
+            board.move(entry[2] >> 5, entry[2] & 31)
+        board.rollback(mark)
+        return line
+
+
+def pile_label(pile_id, p):
+    if pile_id >= PILE_COUNT:
+        return "Talon"
+    if pile_id in (crapette_of(p), waste_of(p)):
+        return "Crapette" if pile_id == crapette_of(p) else "Waste"
+    if pile_id in (crapette_of(1 - p), waste_of(1 - p)):
+        return "opponent's Crapette" if pile_id == crapette_of(1 - p) else "opponent's Waste"
+    if pile_id in FOUNDATIONS:
+        side = "left" if pile_id < FOUNDATION_RIGHT else "right"
+        return f"Foundation {side} {FOUNDATION_SUITS[(pile_id - FOUNDATION_LEFT) % 4]}"
+    side = "left" if pile_id < TABLEAU_RIGHT else "right"
+    return f"Tableau {side} pile {(pile_id - TABLEAU_LEFT) % 4 + 1}"
+
+
+def hint_text(result, board):
+    if not result['moves']:
+        return None
+    p = board.turn
+    steps = []
+    scratch = board.copy()
+    for action in result['moves']:
+        src, dst = action >> 5, action & 31
+        code = scratch.move(src, dst)
+        steps.append(f"{card_name(code)} {pile_label(src, p)} → {pile_label(dst, p)}")
+    more = f" (+{len(steps) - 2} more)" if len(steps) > 2 else ""
+    return "Best line: " + ", then ".join(steps[:2]) + more
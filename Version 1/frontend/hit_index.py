@@ -0,0 +1,77 @@
+# 🧭 Uniform-grid hit testing: which pile/card is under the mouse, without
+# scanning every clickable rect. Entries are only touched when a pile's
+# geometry changes, so per-click (or per-mouse-motion) lookups stay O(1).
+
+CELL_SIZE = 64
+
+
+class HitGrid:
+    """
+    Keyed rects bucketed into CELL_SIZE squares. Each key has one rect and a
+    payload; at(point) returns the payload of the entry containing the point,
+    preferring the lowest priority number when entries overlap (so callers
+    can keep the first-match order of the old linear scans).
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}      # (cx, cy) -> set of keys
+        self.entries = {}    # key -> (rect, payload, priority)
+        self.updates = 0     # geometry changes, for profiling
+
+    def cells_for(self, rect):
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cx, cy
+
+    def set(self, key, rect, payload, priority=0):
+        old = self.entries.get(key)
+        if old is not None and old[0] == rect:
+            # Same geometry: just swap what the rect stands for
+            self.entries[key] = (old[0], payload, priority)
+            return
+        if old is not None:
+            self.unlink(key, old[0])
+        rect = rect.copy()
+        self.entries[key] = (rect, payload, priority)
+        if rect.width > 0 and rect.height > 0:
+            for cell in self.cells_for(rect):
+                self.cells.setdefault(cell, set()).add(key)
+        self.updates += 1
+
+    def remove(self, key):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.unlink(key, old[0])
+            self.updates += 1
+
+    def unlink(self, key, rect):
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        for cell in self.cells_for(rect):
+            keys = self.cells.get(cell)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self.cells[cell]
+
+    def at(self, pos):
+        """Payload under pos, or None."""
+        keys = self.cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size))
+        if not keys:
+            return None
+        best = None
+        for key in keys:
+            rect, payload, priority = self.entries[key]
+            if rect.collidepoint(pos) and (best is None or priority < best[0]):
+                best = (priority, payload)
+        return best[1] if best else None
+
+    def payloads(self):
+        return [payload for _, payload, _ in sorted(self.entries.values(), key=lambda entry: entry[2])]
+
+    def clear(self):
+        # Layout changed wholesale (resize): everything gets re-registered as it is redrawn
+        self.cells.clear()
+        self.entries.clear()
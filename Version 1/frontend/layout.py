@@ -0,0 +1,126 @@
+import os
+
+import pygame
+
+from compact_state import PILE_COUNT, FOUNDATION_LEFT, FOUNDATION_RIGHT, TABLEAU_LEFT, TABLEAU_RIGHT
+
+# 📏 Board geometry for the centerplay UI, worked out once per window size.
+# Everything is designed at 1200 × 850 and scaled uniformly from there: the
+# centre columns stay centred, the player rows hug the top and bottom edges
+# and the buttons the bottom-right corner. At the design size every number
+# comes out exactly as the old hardcoded layout had it.
+BASE_WIDTH, BASE_HEIGHT = 1200, 850
+MIN_SCALE = 0.4
+SCREEN_FILL = 0.9  # share of the desktop the window takes by default
+
+# CRAPETTE_WINDOW=1200x850 pins the window size (benchmarks, scripted runs)
+WINDOW_SIZE = os.environ.get('CRAPETTE_WINDOW')
+
+
+def screen_size():
+    """Desktop resolution, read from the display subsystem without opening a window."""
+    was_init = pygame.display.get_init()
+    pygame.display.init()
+    try:
+        sizes = pygame.display.get_desktop_sizes()
+        if sizes:
+            return sizes[0]
+        info = pygame.display.Info()  # before set_mode this is the desktop mode
+        return info.current_w, info.current_h
+    finally:
+        if not was_init:
+            pygame.display.quit()
+
+
+def window_size():
+    """Starting window size: the design aspect ratio, as big as SCREEN_FILL of the desktop allows."""
+    if WINDOW_SIZE:
+        width, height = WINDOW_SIZE.lower().split('x')
+        return int(width), int(height)
+    desktop_width, desktop_height = screen_size()
+    scale = min(desktop_width * SCREEN_FILL / BASE_WIDTH, desktop_height * SCREEN_FILL / BASE_HEIGHT)
+    return round(BASE_WIDTH * scale), round(BASE_HEIGHT * scale)
+
+
+class Layout:
+    """Every pile anchor, the card size and the button rects for one window size."""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.scale = scale = max(MIN_SCALE, min(width / BASE_WIDTH, height / BASE_HEIGHT))
+
+        def px(value):
+            return round(value * scale)
+
+        # Text keeps its size, so whatever holds text never shrinks below the design size
+        chrome = max(scale, 1.0)
+
+        def chrome_px(value):
+            return round(value * chrome)
+
+        self.card_width, self.card_height = px(70), px(100)
+        self.card_size = (self.card_width, self.card_height)
+        self.fan_offset = px(20)               # tableau fans
+        self.back_offset = max(1, px(2))       # stacked talon / crapette backs
+        self.label_offset = chrome_px(20)      # pile labels sit this far above the pile
+
+        # Player rows: Player 1 along the bottom, Player 2 along the top
+        self.bot_y = height - self.card_height - px(50)
+        self.top_y = px(50)
+        self.row_of = {0: self.bot_y, 1: self.top_y}
+        self.talon_x, self.waste_x, self.crapette_x = px(50), px(180), px(310)
+
+        # Foundations in the two centre columns, tableaus either side of them
+        self.fx_left = width // 2 - self.card_width - px(20)
+        self.fx_right = width // 2 + px(20)
+        self.tx_left = self.fx_left - self.card_width - px(20)
+        self.tx_right = self.fx_right + self.card_width + px(20)
+        fy_start = height // 2 - px(225)
+        self.row_y = [fy_start + i * (self.card_height + px(10)) for i in range(4)]
+
+        self.end_turn_button = pygame.Rect(width - chrome_px(200), height - chrome_px(60), chrome_px(160), chrome_px(40))
+        self.crapette_button = pygame.Rect(width - chrome_px(200), height - chrome_px(110), chrome_px(160), chrome_px(40))
+        self.hint_pos = (px(50), height - px(30))
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    def card_rect(self, x, y):
+        return pygame.Rect(x, y, self.card_width, self.card_height)
+
+    def talon_rect(self, p):
+        return self.card_rect(self.talon_x, self.row_of[p])
+
+    def waste_rect(self, p):
+        return self.card_rect(self.waste_x, self.row_of[p])
+
+    def crapette_rect(self, p):
+        return self.card_rect(self.crapette_x, self.row_of[p])
+
+    def foundation_rect(self, side, i):
+        return self.card_rect(self.fx_left if side == 'left' else self.fx_right, self.row_y[i])
+
+    def tableau_rect(self, side, i, cards=1):
+        """Rect covered by a fan of `cards` cards; the top card is at its far end."""
+        spread = max(cards - 1, 0) * self.fan_offset
+        x = self.tx_left - spread if side == 'left' else self.tx_right
+        return pygame.Rect(x, self.row_y[i], self.card_width + spread, self.card_height)
+
+    def tableau_top_rect(self, side, i, cards=1):
+        spread = max(cards - 1, 0) * self.fan_offset
+        x = self.tx_left - spread if side == 'left' else self.tx_right + spread
+        return self.card_rect(x, self.row_y[i])
+
+    def pile_top_rect(self, pile_id, cards=1):
+        """Where the top card of a compact_state pile id is drawn (revealed cards sit on the talon)."""
+        if pile_id >= PILE_COUNT:
+            return self.talon_rect(pile_id - PILE_COUNT)
+        if pile_id < FOUNDATION_LEFT:
+            p, kind = divmod(pile_id, 3)
+            return (self.crapette_rect, self.talon_rect, self.waste_rect)[kind](p)
+        if pile_id < TABLEAU_LEFT:
+            side = 'left' if pile_id < FOUNDATION_RIGHT else 'right'
+            return self.foundation_rect(side, (pile_id - FOUNDATION_LEFT) % 4)
+        side = 'left' if pile_id < TABLEAU_RIGHT else 'right'
+        return self.tableau_top_rect(side, (pile_id - TABLEAU_LEFT) % 4, cards)
@@ -0,0 +1,310 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+
+from compact_state import NO_CARD, FOUNDATIONS, crapette_of, talon_of, waste_of
+from crapette_engine import CrapetteEngine, END_TURN, deal_board, describe_action, random_policy
+
+# 🌳 Monte Carlo tree search player. Talon cards and the crapette cards under
+# the top are face down, so every iteration first deals them out again at
+# random (a determinization) and then walks one shared tree (single-observer
+# ISMCTS): a child only competes when its move is legal in this deal, and its
+# UCB term counts how often it was available rather than its parent's visits.
+# Playouts are cut after ROLLOUT_TURNS turns and scored by how many cards each
+# player still has to shed.
+#
+# Root parallelization: every worker process grows its own tree from the same
+# position with its own seed, and the root children's visits and values are
+# summed across workers before picking the most visited move.
+#
+#   CRAPETTE_MCTS_WORKERS=4   processes per search (default: all cores; 1 searches in-process)
+EXPLORATION = 0.7
+ROLLOUT_TURNS = 4
+WORKERS = int(os.environ.get('CRAPETTE_MCTS_WORKERS', '0')) or os.cpu_count() or 1
+
+
+def determinize(board, rng):
+    """A copy of board with each player's face-down cards (talon, crapette under the top) reshuffled."""
+    board = board.copy()
+    piles = board.piles
+    for p in (0, 1):
+        crapette, talon = piles[crapette_of(p)], piles[talon_of(p)]
+        buried = len(crapette) - 1 if crapette else 0
+        hidden = list(crapette[:buried]) + list(talon)
+        rng.shuffle(hidden)
+        crapette[:buried] = bytes(hidden[:buried])
+        talon[:] = bytes(hidden[buried:])
+    board.rehash()
+    return board
+
+
+def cards_left(board, p):
+    piles = board.piles
+    left = len(piles[crapette_of(p)]) * 2 + len(piles[talon_of(p)]) + len(piles[waste_of(p)])
+    return left + (board.revealed[p] != NO_CARD)
+
+
+def score(engine, p):
+    """Playout result for player p in [0, 1]: a win is 1, otherwise the card race squashed."""
+    if engine.winner is not None:
+        return 1.0 if engine.winner == p else 0.0
+    board = engine.board
+    lead = cards_left(board, 1 - p) - cards_left(board, p)
+    return 0.5 + 0.5 * math.tanh(lead / 12)
+
+
+def rollout_policy(rng):
+    """Foundation moves first, anything else at random: cheap, and far less aimless than pure random."""
+    choice = rng.choice
+
+    def policy(actions):
+        to_foundation = [a for a in actions if (a & 31) in FOUNDATIONS]
+        return choice(to_foundation or actions)
+    return policy
+
+
+class Node:
+    __slots__ = ('action', 'parent', 'player', 'children', 'visits', 'value', 'available')
+
+    def __init__(self, action=None, parent=None, player=None):
+        self.action = action
+        self.parent = parent
+        self.player = player    # who played `action`; value is from their side
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+        self.available = 0      # iterations in which `action` was legal at the parent
+
+    def select(self, actions, exploration):
+        children = self.children
+        best, best_ucb = None, -1.0
+        for action in actions:
+            child = children[action]
+            child.available += 1
+            ucb = child.value / child.visits + exploration * math.sqrt(math.log(child.available) / child.visits)
+            if ucb > best_ucb:
+                best, best_ucb = child, ucb
+        return best
+
+
+def grow_tree(board, moves_this_turn=0, idle_turns=0, budget=None, iterations=None, seed=None,
+              exploration=EXPLORATION, rollout_turns=ROLLOUT_TURNS):
+    """
+    One tree from board until the time budget or iteration count runs out.
+    Returns the root children's (visits, value) and the playout count, which
+    is all the parent needs to merge several trees.
+    """
+    rng = random.Random(seed)
+    rollout = rollout_policy(rng)
+    root = Node()
+    deadline = time.perf_counter() + budget if budget is not None else None
+    playouts = 0
+    start = time.perf_counter()
+
+    while True:
+        if iterations is not None and playouts >= iterations:
+            break
+        if deadline is not None and playouts & 7 == 0 and time.perf_counter() >= deadline:
+            break
+
+        engine = CrapetteEngine(determinize(board, rng), check_cards=False)
+        engine.moves_this_turn, engine.idle_turns = moves_this_turn, idle_turns
+
+        # Selection: down the tree while every legal move here has been tried
+        node = root
+        while not engine.over:
+            actions = engine.legal_actions()
+            untried = [a for a in actions if a not in node.children]
+            if untried:
+                # Expansion: one new child per iteration
+                action = rng.choice(untried)
+                child = node.children[action] = Node(action, node, engine.board.turn)
+                child.available = 1
+                for a in actions:
+                    if a != action and a in node.children:
+                        node.children[a].available += 1
+                engine.apply(action)
+                node = child
+                break
+            node = node.select(actions, exploration)
+            engine.apply(node.action)
+
+        # Playout: a few turns, then count cards
+        stop_at = engine.turns + rollout_turns
+        while not engine.over and engine.turns < stop_at:
+            engine.apply(rollout(engine.legal_actions()))
+        results = (score(engine, 0), score(engine, 1))
+
+        while node is not root:
+            node.visits += 1
+            node.value += results[node.player]
+            node = node.parent
+        root.visits += 1
+        playouts += 1
+
+    return {
+        'children': {action: (child.visits, child.value) for action, child in root.children.items()},
+        'playouts': playouts,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+class MCTS:
+    """
+    search(engine) returns the chosen action plus the merged root statistics.
+    Give a time budget in seconds, an iteration count (split over the
+    workers), or both; whichever runs out first ends the search. The worker
+    pool starts on the first search and is kept until close().
+    """
+
+    def __init__(self, budget=1.0, iterations=None, workers=WORKERS, exploration=EXPLORATION,
+                 rollout_turns=ROLLOUT_TURNS, seed=None):
+        self.budget = budget
+        self.iterations = iterations
+        self.workers = max(1, workers)
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.rng = random.Random(seed)
+        self.pool = None
+
+    def start_pool(self):
+        if self.pool is None and self.workers > 1:
+            # spawn: workers never inherit the pygame window or the UI's threads
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self.pool
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def search(self, engine):
+        board = engine.board.copy()
+        per_worker = -(-self.iterations // self.workers) if self.iterations is not None else None
+        jobs = [(board, engine.moves_this_turn, engine.idle_turns, self.budget, per_worker,
+                 self.rng.getrandbits(64), self.exploration, self.rollout_turns) for _ in range(self.workers)]
+
+        start = time.perf_counter()
+        pool = self.start_pool()
+        if pool is None:
+            trees = [grow_tree(*jobs[0])]
+        else:
+            trees = [future.result() for future in [pool.submit(grow_tree, *job) for job in jobs]]
+        elapsed = time.perf_counter() - start
+
+        merged = {}
+        for tree in trees:
+            for action, (visits, value) in tree['children'].items():
+                total = merged.setdefault(action, [0, 0.0])
+                total[0] += visits
+                total[1] += value
+        playouts = sum(tree['playouts'] for tree in trees)
+        action = max(merged, key=lambda a: merged[a][0]) if merged else END_TURN
+        return {
+            'action': action,
+            'visits': {a: (visits, value / visits if visits else 0.0) for a, (visits, value) in merged.items()},
+            'playouts': playouts,
+            'workers': self.workers,
+            'elapsed': elapsed,
+            'playouts_per_sec': playouts / elapsed if elapsed else 0.0,
+            'worker_playouts_per_sec': [tree['playouts'] / tree['elapsed'] if tree['elapsed'] else 0.0 for tree in trees],
+        }
+
+    def policy(self):
+        """An engine.play()-style policy: (engine, actions) -> action."""
+        def policy(engine, actions):
+            if len(actions) == 1:
+                return actions[0]
+            action = self.search(engine)['action']
+            return action if action in actions else END_TURN
+        policy.close = self.close
+        return policy
+
+
+def scaling(workers_list, budget, iterations, seed):
+    board_engine = CrapetteEngine(deal_board(random.Random(seed)), check_cards=False)
+    rows = []
+    for workers in workers_list:
+        mcts = MCTS(budget, iterations, workers, seed=seed)
+        try:
+            mcts.search(board_engine)  # starts the pool, so spawning isn't billed to the search
+            result = mcts.search(board_engine)
+        finally:
+            mcts.close()
+        top = sorted(result['visits'].items(), key=lambda item: -item[1][0])[:3]
+        rows.append({
+            'workers': workers,
+            'playouts': result['playouts'],
+            'seconds': round(result['elapsed'], 3),
+            'playouts_per_sec': round(result['playouts_per_sec']),
+            'best': describe_action(result['action']),
+            'top': [[describe_action(a), visits, round(mean, 3)] for a, (visits, mean) in top],
+        })
+    return rows
+
+
+def match(games, budget, iterations, workers, seed):
+    """
+    MCTS as Player 1 against the random policy. Without waste recycling most
+    games run both talons dry and stall, so the card lead at the end (the
+    playout score, crapette cards counting double) says more than wins.
+    """
+    rng = random.Random(seed)
+    mcts = MCTS(budget, iterations, workers, seed=seed)
+    speeds, wins, stalemates, leads = [], 0, 0, []
+    search = mcts.search
+
+    def timed(engine, actions):
+        if len(actions) == 1:
+            return actions[0]
+        result = search(engine)
+        speeds.append(result['playouts_per_sec'])
+        return result['action'] if result['action'] in actions else END_TURN
+
+    try:
+        for _ in range(games):
+            engine = CrapetteEngine.new_game(rng, check_cards=False)
+            result = engine.play([timed, random_policy(random.Random(rng.getrandbits(64)))])
+            wins += result['winner'] == 0
+            stalemates += result['stalemate']
+            leads.append(cards_left(engine.board, 1) - cards_left(engine.board, 0))
+    finally:
+        mcts.close()
+    return {
+        'games': games, 'workers': workers, 'win_rate': wins / games if games else 0.0,
+        'stalemate_rate': stalemates / games if games else 0.0,
+        'mean_card_lead': sum(leads) / games if games else 0.0,
+        'decisions': len(speeds), 'mean_playouts_per_sec': round(sum(speeds) / len(speeds)) if speeds else 0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MCTS search speed and strength against the worker count.")
+    parser.add_argument('--workers', default=None, help="comma separated worker counts to compare (default: 1 and all cores)")
+    parser.add_argument('--time', type=float, default=1.0, help="seconds per search")
+    parser.add_argument('--iterations', type=int, default=None, help="playouts per search, split over the workers")
+    parser.add_argument('--games', type=int, default=0, help="also play this many games against the random policy per worker count")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    budget = None if args.iterations and args.time <= 0 else args.time
+    workers_list = ([int(w) for w in args.workers.split(',')] if args.workers
+                    else sorted({1, os.cpu_count() or 1}))
+    report = {'cores': os.cpu_count(), 'time': budget, 'iterations': args.iterations,
+              'scaling': scaling(workers_list, budget, args.iterations, args.seed)}
+    if args.games:
+        report['matches'] = [match(args.games, budget, args.iterations, w, args.seed) for w in workers_list]
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
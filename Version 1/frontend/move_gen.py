@@ -0,0 +1,323 @@
+from compact_state import FOUNDATION_LEFT
+from card_rules import FOUNDATION, TABLEAU, CRAPETTE, STRIDE, EMPTY
+from ui_helpers import card_value
+
+# Which of the ui_helpers scans a move counts for
+HINT = 1       # suggest_move
+ANY = 2        # has_any_valid_move (skips pointless tableau shuffles)
+ANYWHERE = 4   # can_play_anywhere for the crapette top card
+
+# Placement rules, one per kind of (source, destination) pair
+TO_FOUNDATION, SHUFFLE, TO_TABLEAU, TO_WASTE, TO_CRAPETTE = range(5)
+
+PLAYER_INDEX = {"Player 1": 0, "Player 2": 1}
+NO_MOVES_TEXT = "🤷 No valid moves found."
+
+FOUNDATION_KEYS = [('foundation_left', i) for i in range(4)] + [('foundation_right', i) for i in range(4)]
+TABLEAU_KEYS = [('tableau_left', i) for i in range(4)] + [('tableau_right', i) for i in range(4)]
+
+# handle_selection sources that are piles here (the revealed talon card is not)
+SELECTION_KEYS = {'crapette': ('crapette', 0), 'waste': ('waste', 0), 'p2_crapette': ('crapette', 1), 'p2_waste': ('waste', 1)}
+PLAYER_PILES = ('crapette', 'talon', 'waste')
+BOARD_SIDES = ('foundation_left', 'foundation_right', 'tableau_left', 'tableau_right')
+
+
+def selection_key(source, index):
+    """The pile key behind a handle_selection source, None for one that isn't tracked."""
+    if source in ('tableau_left', 'tableau_right'):
+        return source, index
+    return SELECTION_KEYS.get(source)
+
+
+def pile_key(pile_id):
+    """The pile key behind a compact_state pile id (talons and revealed slots aren't tracked)."""
+    if pile_id < FOUNDATION_LEFT:
+        return PLAYER_PILES[pile_id % 3], pile_id // 3
+    return BOARD_SIDES[(pile_id - FOUNDATION_LEFT) // 4], (pile_id - FOUNDATION_LEFT) % 4
+
+
+def source_pairs(p):
+    """Every (source, destination) pair player p could ever move along."""
+    crapette, waste = ('crapette', p), ('waste', p)
+    pairs = [(crapette, dst) for dst in FOUNDATION_KEYS + TABLEAU_KEYS + [('waste', 1 - p), ('crapette', 1 - p)]]
+    pairs += [(waste, dst) for dst in FOUNDATION_KEYS + TABLEAU_KEYS]
+    for side, i in TABLEAU_KEYS:
+        pairs += [((side, i), dst) for dst in FOUNDATION_KEYS]
+        pairs += [((side, i), (side, j)) for j in range(4) if j != i]
+    return pairs
+
+
+def goes_on(table):
+    """Per card face, the target faces the table lets it go on."""
+    return [[t for t in range(EMPTY) if table[c * STRIDE + t]] for c in range(EMPTY)]
+
+
+def takes(table):
+    """Per target face, the card faces the table lets go on it."""
+    return [[c for c in range(EMPTY) if table[c * STRIDE + t]] for t in range(EMPTY)]
+
+
+# 🗂️ The card_rules tables turned around, so a changed pile only looks at the
+# piles whose top card it could now play with rather than at every pair.
+# Opponent's waste moves aren't in here: their rule isn't a table (see evaluate).
+GOES_ON = [sorted(set(f + t + c)) for f, t, c in zip(goes_on(FOUNDATION), goes_on(TABLEAU), goes_on(CRAPETTE))]
+TAKES = {'foundation_left': takes(FOUNDATION), 'foundation_right': takes(FOUNDATION),
+         'tableau_left': takes(TABLEAU), 'tableau_right': takes(TABLEAU), 'crapette': takes(CRAPETTE)}
+
+
+def pair_rule(src, dst):
+    """Which placement rule a (source, destination) pair is judged by."""
+    if dst[0].startswith('foundation'):
+        return TO_FOUNDATION
+    if dst[0].startswith('tableau'):
+        return SHUFFLE if src[0].startswith('tableau') else TO_TABLEAU
+    return TO_WASTE if dst[0] == 'waste' else TO_CRAPETTE
+
+
+def scan_order(move):
+    # Position of a move in suggest_move's fixed scan, so the first hint matches it exactly
+    (src, si), (dst, di) = move
+    if src in ('crapette', 'waste'):
+        row = 0 if src == 'crapette' else 1
+        if dst.startswith('foundation'):
+            return row, 0, 0
+        if dst.startswith('tableau'):
+            return row, 1, TABLEAU_KEYS.index((dst, di))
+        return row, 2, 0
+    row = 2 + TABLEAU_KEYS.index((src, si))
+    if dst.startswith('foundation'):
+        return row, 0, 0
+    return row, 1, di
+
+
+class MoveGenerator:
+    """
+    Keeps the legal moves of both players up to date as cards move. A move
+    only depends on its source and destination piles, so when a pile changes
+    only the moves touching it are re-evaluated; "any move?", "is the crapette
+    top playable?" and the hint are then answered from running counts.
+
+    Whoever moves a card says which piles it touched with moved(src, dst);
+    on the next query only those piles' moves are re-evaluated: the ones
+    that were legal, plus the pairs whose other pile has a top card the new
+    top could play with (found through an index of pile tops by face).
+    sync() compares every pile instead, for when the caller can't tell.
+    """
+
+    def __init__(self, player1, player2, foundation_left, foundation_right, tableau_left, tableau_right):
+        self.players = [player1, player2]
+        self.piles = {}
+        for p, player in enumerate(self.players):
+            self.piles[('crapette', p)] = player['crapette']
+            self.piles[('waste', p)] = player['waste']
+        for i in range(4):
+            self.piles[('foundation_left', i)] = foundation_left[i]
+            self.piles[('foundation_right', i)] = foundation_right[i]
+            self.piles[('tableau_left', i)] = tableau_left[i]
+            self.piles[('tableau_right', i)] = tableau_right[i]
+
+        self.moves = [{}, {}]        # per player: (src, dst) -> HINT/ANY/ANYWHERE flags
+        self.counts = [{HINT: 0, ANY: 0, ANYWHERE: 0}, {HINT: 0, ANY: 0, ANYWHERE: 0}]
+        # Pairs are numbered; everything below refers to them by number
+        self.pairs = []              # (player, (src, dst), src pile, dst pile, rule, from crapette)
+        self.pairs_of = {}           # (src, dst) -> pair numbers, one per player that can make the move
+        self.into = {key: [] for key in self.piles}     # pile -> pairs ending on it
+        self.special = {key: [] for key in self.piles}  # pile -> its pairs the face index can't find
+        for p in (0, 1):
+            for src, dst in source_pairs(p):
+                rule = pair_rule(src, dst)
+                n = len(self.pairs)
+                self.pairs.append((p, (src, dst), self.piles[src], self.piles[dst], rule, src[0] == 'crapette'))
+                self.pairs_of.setdefault((src, dst), []).append(n)
+                self.into[dst].append(n)
+                if rule == TO_WASTE:
+                    self.special[src].append(n)
+        self.legal = {key: set() for key in self.piles}  # pile -> pairs touching it that are legal now
+        self.tops = {}               # pile -> face of its top card, None when empty
+        self.by_face = {}            # face -> piles with that top card
+        self.empty_tableaus = set()
+        self.empty_foundations = set()
+        self.order = {}
+        self.signatures = {}
+        self.dirty = set()
+        self.evaluations = 0
+        for key in self.piles:
+            self.index_top(key)
+        self.evaluate_pairs(range(len(self.pairs)))
+
+    def signature(self, key):
+        pile = self.piles[key]
+        return (len(pile), id(pile[-1])) if pile else (0, None)
+
+    def evaluate(self, pile, target, rule, from_crapette):
+        if not pile:
+            return 0
+        face = pile[-1]['face']
+        self.evaluations += 1
+
+        if rule == TO_FOUNDATION:
+            if not FOUNDATION[face * STRIDE + (target[-1]['face'] if target else EMPTY)]:
+                return 0
+            return HINT | ANY | ANYWHERE if from_crapette else HINT | ANY
+
+        if rule == SHUFFLE:
+            # Same-side shuffles only count for has_any_valid_move when neither pile is a lone card
+            if not target:
+                return HINT | ANY if len(pile) > 1 else HINT
+            if not TABLEAU[face * STRIDE + target[-1]['face']]:
+                return 0
+            return HINT | ANY if len(pile) > 1 and len(target) > 1 else HINT
+
+        if rule == TO_TABLEAU:
+            if not target:
+                return HINT | ANY | ANYWHERE if from_crapette else HINT | ANY
+            if not TABLEAU[face * STRIDE + target[-1]['face']]:
+                return 0
+            flags = HINT | ANYWHERE if from_crapette else HINT
+            return flags | ANY if len(target) > 1 else flags
+
+        if not target:
+            return 0
+        card, top = pile[-1], target[-1]
+        if rule == TO_WASTE:
+            if (
+                card['suit'] == top['suit']
+                and abs(card_value(card) - card_value(top)) == 1
+                and card['color'] != top['color']
+            ):
+                return HINT | ANY | ANYWHERE
+            return 0
+        return ANY if CRAPETTE[face * STRIDE + top['face']] else 0
+
+    def index_top(self, key):
+        self.signatures[key] = self.signature(key)
+        old = self.tops.get(key)
+        if old is not None:
+            self.by_face[old].discard(key)
+        pile = self.piles[key]
+        face = pile[-1]['face'] if pile else None
+        self.tops[key] = face
+        if face is not None:
+            self.by_face.setdefault(face, set()).add(key)
+        if key[0].startswith('tableau'):
+            (self.empty_tableaus.discard if pile else self.empty_tableaus.add)(key)
+        elif key[0].startswith('foundation'):
+            (self.empty_foundations.discard if pile else self.empty_foundations.add)(key)
+
+    def update(self, *keys):
+        """Re-evaluate the moves a change to these piles can have made or unmade."""
+        for key in keys:
+            self.index_top(key)
+        pairs_of, by_face, todo = self.pairs_of, self.by_face, set()
+        for key in keys:
+            todo |= self.legal[key]
+            face = self.tops[key]
+            if face is not None:
+                # From here: piles whose top this card goes on, empty piles it may start
+                todo.update(self.special[key])
+                targets = [dst for t in GOES_ON[face] for dst in by_face.get(t, ())]
+                targets += self.empty_tableaus
+                if FOUNDATION[face * STRIDE + EMPTY]:
+                    targets += self.empty_foundations
+                for dst in targets:
+                    todo.update(pairs_of.get((key, dst), ()))
+            # Onto here: piles whose top goes on this one; an empty pile or a waste has every source checked
+            sources = TAKES.get(key[0])
+            if face is None or sources is None:
+                todo.update(self.into[key])
+            else:
+                for c in sources[face]:
+                    for src in by_face.get(c, ()):
+                        todo.update(pairs_of.get((src, key), ()))
+        self.evaluate_pairs(todo)
+
+    def evaluate_pairs(self, numbers):
+        evaluate, pairs, legal = self.evaluate, self.pairs, self.legal
+        for n in numbers:
+            p, move, pile, target, rule, from_crapette = pairs[n]
+            moves = self.moves[p]
+            old = moves.get(move, 0)
+            new = evaluate(pile, target, rule, from_crapette)
+            if old == new:
+                continue
+            counts = self.counts[p]
+            for flag in (HINT, ANY, ANYWHERE):
+                counts[flag] += bool(new & flag) - bool(old & flag)
+            src, dst = move
+            if new:
+                moves[move] = new
+                legal[src].add(n)
+                legal[dst].add(n)
+            else:
+                del moves[move]
+                legal[src].discard(n)
+                legal[dst].discard(n)
+
+    def moved(self, *keys):
+        """These piles changed (keys it doesn't track, or None, are ignored); the next query picks them up."""
+        self.dirty.update(key for key in keys if key in self.piles)
+
+    def refresh(self):
+        if self.dirty:
+            signatures, signature = self.signatures, self.signature
+            changed = [key for key in self.dirty if signatures[key] != signature(key)]
+            self.dirty.clear()
+            if changed:
+                self.update(*changed)
+
+    def sync(self):
+        """Compare every pile's signature and pick up whatever changed, told or not."""
+        self.dirty.clear()
+        changed = [key for key in self.piles if self.signatures.get(key) != self.signature(key)]
+        if changed:
+            self.update(*changed)
+        return len(changed)
+
+    def has_any_valid_move(self, p):
+        self.refresh()
+        return self.counts[p][ANY] > 0
+
+    def crapette_playable(self, p):
+        self.refresh()
+        return self.counts[p][ANYWHERE] > 0
+
+    def can_draw_talon(self, p):
+        return not self.crapette_playable(p)
+
+    def legal_moves(self, p):
+        self.refresh()
+        moves = [move for move, flags in self.moves[p].items() if flags & HINT]
+        moves.sort(key=self.order_of)
+        return moves
+
+    def order_of(self, move):
+        if move not in self.order:
+            self.order[move] = scan_order(move)
+        return self.order[move]
+
+    def suggest_move(self, p):
+        self.refresh()
+        if not self.counts[p][HINT]:
+            return NO_MOVES_TEXT
+        move = min((m for m, flags in self.moves[p].items() if flags & HINT), key=self.order_of)
+        return describe_move(move, self.piles[move[0]][-1], self.piles[move[1]])
+
+
+def describe_move(move, card, target):
+    (src, si), (dst, di) = move
+    what = f"You can move {card['rank']} of {card['suit_name']}"
+    if src in ('crapette', 'waste'):
+        origin = "Crapette" if src == 'crapette' else "Waste"
+        if dst.startswith('foundation'):
+            return f"{what} from {origin} to Foundation."
+        if dst.startswith('tableau'):
+            if not target:
+                return f"{what} from {origin} to an empty Tableau pile."
+            return f"{what} from {origin} to Tableau pile {TABLEAU_KEYS.index((dst, di)) + 1}."
+        return f"{what} from {origin} to opponent's Waste."
+    origin = f"Tableau {src[len('tableau_'):]} pile {si + 1}"
+    if dst.startswith('foundation'):
+        return f"{what} from {origin} to Foundation."
+    if not target:
+        return f"{what} from {origin} to empty pile {di + 1}."
+    return f"{what} from {origin} to pile {di + 1}."
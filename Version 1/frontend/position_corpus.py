@@ -0,0 +1,298 @@
+import os
+import struct
+import sys
+
+import numpy as np
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+
+from compact_state import Board, NO_CARD, PILE_COUNT, FOUNDATION_LEFT, TABLEAU_LEFT, crapette_of, talon_of, waste_of
+
+# 🗃️ Position corpus for offline analysis: one fixed-size record per board
+# position, opened as a NumPy memmap so a multi-GB file can be scanned,
+# filtered and sampled without reading it into RAM.
+#
+#   header   b'CRAPPOS' + version byte, record size (uint32), 4 spare bytes
+#   records  RECORD_DTYPE, back to back
+#
+# cards holds every pile's codes bottom to top, pile 0 first; counts says
+# where each pile starts and ends. Revealed cards sit in their own field, so
+# the rest of cards is padding (NO_CARD).
+MAGIC = b'CRAPPOS'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<7sBI4x')
+
+RECORD_DTYPE = np.dtype([
+    ('game', '<u4'),
+    ('move', '<u2'),        # actions played so far in the game
+    ('turn', 'u1'),
+    ('flags', 'u1'),
+    ('hash', '<u8'),        # Board.hash, for duplicate detection
+    ('counts', 'u1', PILE_COUNT),
+    ('revealed', 'u1', 2),
+    ('cards', 'u1', 104),
+])
+RECORD = struct.Struct(f'<IHBBQ{PILE_COUNT}s2s104s')
+assert RECORD.size == RECORD_DTYPE.itemsize == 144
+
+SCAN_CHUNK = 1 << 18  # records per chunk when scanning: ~36 MB
+
+
+def _counts(columns):
+    return columns['counts'].astype(np.int32)
+
+
+# Keys the sidecar indexes are built on: name -> small non-negative int per record
+INDEX_KEYS = {
+    'move': lambda records: records['move'],
+    'p1_crapette': lambda records: records['counts'][:, crapette_of(0)],
+    'p2_crapette': lambda records: records['counts'][:, crapette_of(1)],
+    'p1_talon': lambda records: records['counts'][:, talon_of(0)],
+    'p2_talon': lambda records: records['counts'][:, talon_of(1)],
+    'p1_waste': lambda records: records['counts'][:, waste_of(0)],
+    'p2_waste': lambda records: records['counts'][:, waste_of(1)],
+    'foundations': lambda records: _counts(records)[:, FOUNDATION_LEFT:TABLEAU_LEFT].sum(axis=1),
+    'tableaus': lambda records: _counts(records)[:, TABLEAU_LEFT:].sum(axis=1),
+}
+
+
+def pack_board(board, game=0, move=0, flags=0):
+    cards = b''.join(board.piles)
+    return RECORD.pack(game, move, board.turn, flags, board.hash, bytes(len(pile) for pile in board.piles),
+                       bytes(board.revealed), cards + bytes([NO_CARD]) * (104 - len(cards)))
+
+
+def unpack_board(record):
+    """Board for one record (a row of PositionCorpus.records)."""
+    board = Board()
+    board.turn = int(record['turn'])
+    board.revealed[:] = record['revealed'].tobytes()
+    cards = record['cards'].tobytes()
+    start = 0
+    for pile, n in zip(board.piles, record['counts'].tolist()):
+        pile[:] = cards[start:start + n]
+        start += n
+    board.hash = int(record['hash'])
+    return board
+
+
+class PositionWriter:
+    """Appends positions to a corpus file, one 144-byte record each."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+        self.written = 0
+
+    def add(self, board, game=0, move=0, flags=0):
+        self.file.write(pack_board(board, game, move, flags))
+        self.written += 1
+
+    def add_piles(self, player1, player2, foundation_left, foundation_right, tableau_left, tableau_right,
+                  current_turn="Player 1", game=0, move=0):
+        """Straight from the frontend's pile structures."""
+        self.add(Board.from_piles(player1, player2, foundation_left, foundation_right, tableau_left, tableau_right,
+                                  current_turn), game, move)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def counting_index(records, key, chunk=SCAN_CHUNK, out=None):
+    """
+    (order, offsets) for a small-int key: records with key k are
+    order[offsets[k]:offsets[k + 1]], in file order. Two chunked passes, so
+    only one chunk of the corpus is in memory at a time; out can be a memmap
+    to write order straight to disk.
+    """
+    n = len(records)
+    counts = np.zeros(1, dtype=np.int64)
+    for start in range(0, n, chunk):
+        found = np.bincount(key(records[start:start + chunk]))
+        if len(found) > len(counts):
+            counts = np.pad(counts, (0, len(found) - len(counts)))
+        counts[:len(found)] += found
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    order = out if out is not None else np.empty(n, dtype=np.uint32 if n < 1 << 32 else np.uint64)
+    cursor = offsets[:-1].copy()
+    for start in range(0, n, chunk):
+        keys = np.asarray(key(records[start:start + chunk]), dtype=np.int64)
+        by_key = np.argsort(keys, kind='stable')
+        sorted_keys = keys[by_key]
+        rank = np.arange(len(keys)) - np.searchsorted(sorted_keys, sorted_keys)
+        order[cursor[sorted_keys] + rank] = start + by_key
+        cursor += np.bincount(keys, minlength=len(cursor))
+    return order, offsets
+
+
+class PositionCorpus:
+    """
+    Read side. records is a read-only memmap of RECORD_DTYPE: slicing it,
+    records['move'] etc. are views, not copies. Indexes live next to the
+    corpus in <path>.idx/ and are (re)built by build_indexes() when missing or
+    out of date, so at_move() and with_count() only touch matching records.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, size = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a position corpus")
+        if version > FORMAT_VERSION or size != RECORD_DTYPE.itemsize:
+            raise ValueError(f"{path}: unsupported corpus version {version} / record size {size}")
+        count = (os.path.getsize(path) - HEADER.size) // size
+        self.records = (np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+                        if count else np.empty(0, dtype=RECORD_DTYPE))
+        self.index_dir = path + '.idx'
+        self.indexes = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, i):
+        return self.records[i]
+
+    def board(self, i):
+        return unpack_board(self.records[i])
+
+    def boards(self, indices):
+        return [unpack_board(self.records[i]) for i in indices]
+
+    # 📑 Indexes
+
+    def index(self, name):
+        if name not in self.indexes:
+            order_path = os.path.join(self.index_dir, f"{name}.order.npy")
+            offsets_path = os.path.join(self.index_dir, f"{name}.offsets.npy")
+            if os.path.exists(offsets_path):
+                offsets = np.load(offsets_path)
+                if offsets[-1] == len(self):
+                    self.indexes[name] = (np.load(order_path, mmap_mode='r'), offsets)
+                    return self.indexes[name]
+            self.build_indexes([name])
+        return self.indexes[name]
+
+    def build_indexes(self, names=None):
+        os.makedirs(self.index_dir, exist_ok=True)
+        for name in names or INDEX_KEYS:
+            order_path = os.path.join(self.index_dir, f"{name}.order.npy")
+            dtype = np.uint32 if len(self) < 1 << 32 else np.uint64
+            out = np.lib.format.open_memmap(order_path, mode='w+', dtype=dtype, shape=(len(self),)) if len(self) else None
+            order, offsets = counting_index(self.records, INDEX_KEYS[name], out=out)
+            if out is not None:
+                out.flush()
+            else:
+                np.save(order_path, order)
+            np.save(os.path.join(self.index_dir, f"{name}.offsets.npy"), offsets)
+            self.indexes[name] = (np.load(order_path, mmap_mode='r'), offsets)
+
+    def lookup(self, name, low, high=None):
+        """Record indices with low <= key < high (high defaults to low + 1), in file order per key."""
+        order, offsets = self.index(name)
+        high = low + 1 if high is None else high
+        low, high = max(low, 0), min(high, len(offsets) - 1)
+        if low >= high:
+            return np.empty(0, dtype=order.dtype)
+        return order[offsets[low]:offsets[high]]
+
+    def at_move(self, move, stop=None):
+        return self.lookup('move', move, stop)
+
+    def with_count(self, name, low, high=None):
+        """e.g. with_count('p1_crapette', 0, 3): positions where player 1 has fewer than 3 crapette cards."""
+        return self.lookup(name, low, high)
+
+    # 🔎 Scans
+
+    def chunks(self, chunk=SCAN_CHUNK):
+        for start in range(0, len(self), chunk):
+            yield start, self.records[start:start + chunk]
+
+    def where(self, predicate, chunk=SCAN_CHUNK):
+        """Indices of records where predicate(chunk_view) is true, one chunk in memory at a time."""
+        found = [start + np.flatnonzero(predicate(records)) for start, records in self.chunks(chunk)]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def sample(self, n, rng=None, indices=None):
+        """n random records (copies of just those rows), from the whole corpus or from indices."""
+        rng = rng if rng is not None else np.random.default_rng()
+        pool = len(self) if indices is None else len(indices)
+        picked = np.sort(rng.choice(pool, size=min(n, pool), replace=False))
+        return self.records[picked if indices is None else np.sort(np.asarray(indices)[picked])]
+
+
+def record_self_play(path, games=100, every=1, seed=0, **rules):
+    """Fill a corpus with positions from seeded random CrapetteEngine games."""
+    import random
+    from crapette_engine import CrapetteEngine, random_policy
+
+    rng = random.Random(seed)
+    policies = [random_policy(random.Random(seed + 1)), random_policy(random.Random(seed + 2))]
+    with PositionWriter(path) as writer:
+        for game in range(games):
+            engine = CrapetteEngine.new_game(rng, **rules)
+            while not engine.over:
+                if engine.actions_played % every == 0:
+                    writer.add(engine.board, game, min(engine.actions_played, 0xFFFF))
+                engine.apply(policies[engine.turn](engine, engine.legal_actions()))
+            writer.add(engine.board, game, min(engine.actions_played, 0xFFFF), flags=1)  # flags bit 0: final position
+        return writer.written
+
+
+def record_from_games(path, record_path):
+    """Every position of every game in a game record file (VARIANT_BOARD games only)."""
+    import random
+    from crapette_engine import deal_board
+    from record_format import read_games, VARIANT_BOARD
+    from compact_state import TURN_OP
+
+    with PositionWriter(path) as writer:
+        for game_no, game in enumerate(read_games(record_path)):
+            if game.variant != VARIANT_BOARD:
+                continue
+            board = deal_board(random.Random(game.seed))
+            writer.add(board, game_no, 0)
+            for move_no, op in enumerate(game.moves, 1):
+                if op == TURN_OP:
+                    board.switch_turn()
+                else:
+                    board.move(op >> 5, op & 31)
+                writer.add(board, game_no, min(move_no, 0xFFFF))
+        return writer.written
+
+
+if __name__ == "__main__":
+    # python position_corpus.py corpus.crpos [games] [game_record.crec]
+    import time
+
+    path = sys.argv[1] if len(sys.argv) > 1 else 'positions.crpos'
+    start = time.perf_counter()
+    if len(sys.argv) > 3:
+        added = record_from_games(path, sys.argv[3])
+    else:
+        added = record_self_play(path, int(sys.argv[2]) if len(sys.argv) > 2 else 100)
+    print(f"🗃️ {added} positions written in {time.perf_counter() - start:.2f}s")
+
+    corpus = PositionCorpus(path)
+    start = time.perf_counter()
+    corpus.build_indexes()
+    print(f"📑 {len(corpus)} positions ({os.path.getsize(path) / 1e6:.1f} MB), indexes built in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    early = corpus.at_move(0, 50)
+    close = corpus.with_count('p1_crapette', 0, 3)
+    scanned = corpus.where(lambda r: r['revealed'][:, 0] != NO_CARD)
+    print(f"🔎 {len(early)} before move 50, {len(close)} with p1 crapette < 3, {len(scanned)} with a revealed p1 card "
+          f"({(time.perf_counter() - start) * 1000:.1f} ms)")
@@ -0,0 +1,144 @@
+import pygame
+
+# Sentinel so a region that was never drawn always compares as changed
+UNDRAWN = object()
+
+
+def pile_signature(pile, selected_card):
+    # What a face-up pile looks like on screen: size, top card, selection
+    if not pile:
+        return 0, None, False
+    top = pile[-1]
+    return len(pile), id(top), top is selected_card
+
+
+def fan_signature(pile, selected_card):
+    # Fanned stacks show every card, so the selection can be anywhere in them:
+    # say which card it is, a cached composite must not survive it moving along the fan
+    if not pile:
+        return 0, None, None
+    return len(pile), id(pile[-1]), next((i for i, card in enumerate(pile) if card is selected_card), None)
+
+
+class DirtyRenderer:
+    """
+    Retained-mode layer over the screen. Each board region (a pile, the
+    buttons, the hint line) is registered with a signature describing what it
+    shows; only regions whose signature changed are cleared and redrawn, and
+    only their rects are pushed to the display.
+
+    Two cached layers sit under the regions: a static background (felt,
+    labels) that clearing copies from instead of filling, and one composite
+    surface per pile, so repainting a pile is a single blit however deep it is.
+    """
+
+    def __init__(self, screen, background_color):
+        self.screen = screen
+        self.background_color = background_color
+        self.signatures = {}    # region key -> signature it was last drawn with
+        self.rects = {}         # region key -> screen rect it last covered
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.background = None   # static layer, painted once per layout
+        self.composites = {}     # pile key -> (signature, rect, surface)
+        self.frames_drawn = 0
+        self.regions_drawn = 0
+        self.composites_built = 0
+
+    def invalidate(self):
+        # Window exposed, resized, or a new game: repaint everything
+        self.full_redraw = True
+
+    def set_background(self, surface):
+        # New layout: every composite was cut from the old background
+        self.background = surface
+        self.composites = {}
+        self.invalidate()
+
+    def clear(self, rect):
+        if self.background is None:
+            self.screen.fill(self.background_color, rect)
+        else:
+            self.screen.blit(self.background, rect, rect)
+
+    def composite(self, key, signature, rect, paint):
+        """
+        Blit a pile's cached surface, re-painting it only when its signature
+        or rect changed. paint(surface, dx, dy) draws the pile at its screen
+        coordinates shifted by (dx, dy). The surface starts as a copy of the
+        background under it, so it's opaque and the blit is a plain copy.
+        """
+        rect = rect.clip(self.screen.get_rect())
+        cached = self.composites.get(key)
+        if cached is None or cached[0] != signature or cached[1] != rect:
+            if self.background is not None:
+                surface = self.background.subsurface(rect).copy()
+            else:
+                surface = pygame.Surface(rect.size)
+                surface.fill(self.background_color)
+            paint(surface, -rect.x, -rect.y)
+            cached = self.composites[key] = (signature, rect, surface)
+            self.composites_built += 1
+        return self.screen.blit(cached[2], rect)
+
+    def render(self, regions):
+        """
+        regions: list of (key, signature, draw) in back-to-front order, where
+        draw() paints the region and returns the Rect it covered.
+        """
+        if self.full_redraw:
+            self.clear(self.screen.get_rect())
+            dirty = {key for key, _, _ in regions}
+        else:
+            dirty = {key for key, signature, _ in regions if self.signatures.get(key, UNDRAWN) != signature}
+            if not dirty:
+                return False
+
+            # Anything overlapping a cleared area has to be repainted as well
+            damage = [self.rects[key] for key in dirty if key in self.rects]
+            grew = True
+            while grew:
+                grew = False
+                for key, _, _ in regions:
+                    rect = self.rects.get(key)
+                    if key not in dirty and rect is not None and rect.collidelist(damage) != -1:
+                        dirty.add(key)
+                        damage.append(rect)
+                        grew = True
+            for rect in damage:
+                self.clear(rect)
+            self.dirty_rects.extend(damage)
+
+        drawn = []
+        for key, signature, draw in regions:
+            if key in dirty:
+                drawn.append(self._draw(key, signature, draw))
+
+        # A region that grew may now cover a neighbour; put the neighbour back on top
+        if not self.full_redraw:
+            for key, signature, draw in regions:
+                rect = self.rects.get(key)
+                if key not in dirty and rect is not None and rect.collidelist(drawn) != -1:
+                    self._draw(key, signature, draw)
+
+        return True
+
+    def _draw(self, key, signature, draw):
+        rect = draw()
+        self.signatures[key] = signature
+        self.rects[key] = rect
+        self.dirty_rects.append(rect)
+        self.regions_drawn += 1
+        return rect
+
+    def present(self):
+        if self.full_redraw:
+            pygame.display.flip()
+        elif self.dirty_rects:
+            pygame.display.update(self.dirty_rects)
+        else:
+            return False
+        self.full_redraw = False
+        self.dirty_rects = []
+        self.frames_drawn += 1
+        return True
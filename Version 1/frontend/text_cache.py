@@ -0,0 +1,100 @@
+import os
+from collections import OrderedDict
+
+# 🔤 Rendered text surfaces, reused between frames. Labels, button captions,
+# suit markers and card ranks are the same few strings every frame, so
+# Font.render only has to run once per (font, text, color, antialias).
+
+
+class TextCache:
+    """
+    Bounded LRU of Font.render results. Varying strings (hint lines) push out
+    the least recently drawn entries instead of growing the cache.
+
+    The font object is part of the key. Fonts are created once and text keeps
+    its size when the window is resized (layout.py only scales the board), so
+    nothing ever has to be evicted for a font or scale change.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()   # (font, text, antialias, color, background) -> Surface
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Drop-in for font.render(text, antialias, color, background)."""
+        key = (font, text, antialias, tuple(color), background and tuple(background))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.evictions += len(self.entries)
+        self.entries.clear()
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hit_ratio(), 3),
+        }
+
+
+# DejaVu Sans ships with the game: pygame's default font has no ♠ ♥ ♦ ♣ glyphs,
+# and going through SysFont would mean scanning the system fonts
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "fonts")
+FONT_FILES = {False: os.path.join(FONT_DIR, "DejaVuSans.ttf"), True: os.path.join(FONT_DIR, "DejaVuSans-Bold.ttf")}
+
+
+class LazyFont:
+    """
+    Stands in for a pygame Font and only loads it on first use, so importing a
+    UI module never runs font.init(). It loads the bundled DejaVu Sans file
+    directly, so there is no system font scan either.
+    """
+
+    def __init__(self, size, bold=False):
+        self.size = size
+        self.bold = bold
+        self.font = None
+
+    def load(self):
+        if self.font is None:
+            import pygame
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self.font = pygame.font.Font(FONT_FILES[self.bold], self.size)
+        return self.font
+
+    def render(self, *args):
+        return (self.font or self.load()).render(*args)
+
+    def __getattr__(self, name):
+        # size(), get_linesize() and the rest of the Font API
+        return getattr(self.load(), name)
+
+
+# One cache for every frontend module
+TEXT_CACHE = TextCache()
+render_text = TEXT_CACHE.render
@@ -1,47 +1,59 @@
 from ui_helpers import can_play_anywhere
+from event_log import LOG
 
 
 def handle_selection(card_areas, pos, current_selected):
-    for rect, card, source, index in card_areas:
-        if rect.collidepoint(pos):
-            if current_selected and current_selected[0] == card:
-                return None, None, None  # Deselect if same card clicked
-            return card, source, index
+    # card_areas: a hit_index.HitGrid of (rect, card, source, index)
+    hit = card_areas.at(pos)
+    if hit:
+        _, card, source, index = hit
+        if current_selected and current_selected[0] == card:
+            return None, None, None  # Deselect if same card clicked
+        return card, source, index
     return None, None, None # Clicked outside → deselect
 
 FOUNDATION_SUIT_INDEX = {'♥': 0, '♠': 1, '♣': 2, '♦': 3}
 
+# The try_place_* functions return the (pile, index) key the card landed on, as
+# MoveGenerator names piles, or False when it couldn't go there.
+
 def try_place_on_foundation(foundations, selected_card, selected_from, selected_index, piles):
     correct_index = FOUNDATION_SUIT_INDEX[selected_card['suit']]
-    
-    for rect, side, i in foundations:
-        if i != correct_index:
-            continue  # ❌ Skip slots not for this suit
-        
-        pile = piles['foundation_left'][i] if side == 'left' else piles['foundation_right'][i]
-        
-        if rect.collidepoint(piles['mouse']) and piles['can_play_on_foundation'](selected_card, pile):
-            pile.append(selected_card)
-            remove_card_from_source(piles, selected_from, selected_index)
-            return True
-            
+
+    hit = foundations.at(piles['mouse'])
+    if not hit:
+        return False
+    _, side, i = hit
+    if i != correct_index:
+        return False  # ❌ Not the slot for this suit
+
+    pile = piles['foundation_left'][i] if side == 'left' else piles['foundation_right'][i]
+
+    if piles['can_play_on_foundation'](selected_card, pile):
+        pile.append(selected_card)
+        remove_card_from_source(piles, selected_from, selected_index)
+        return f"foundation_{side}", i
+
     return False
 
 
 def try_place_on_tableau(tableaus, selected_card, selected_from, selected_index, piles):
-    for rect, side, i in tableaus:
-        pile = piles['tableau_left'][i] if side == 'left' else piles['tableau_right'][i]
-        if rect.collidepoint(piles['mouse']) and (not pile or piles['can_play_on_tableau'](selected_card, pile[-1])):
-            pile.append(selected_card)
-            remove_card_from_source(piles, selected_from, selected_index)
-            return True
+    hit = tableaus.at(piles['mouse'])
+    if not hit:
+        return False
+    _, side, i = hit
+    pile = piles['tableau_left'][i] if side == 'left' else piles['tableau_right'][i]
+    if not pile or piles['can_play_on_tableau'](selected_card, pile[-1]):
+        pile.append(selected_card)
+        remove_card_from_source(piles, selected_from, selected_index)
+        return f"tableau_{side}", i
     return False
 
 def try_place_on_crapette(opponent_crapette, selected_card, selected_from, selected_index, piles):
     if opponent_crapette and piles['can_play_on_crapette'](selected_card, opponent_crapette[-1]):
         opponent_crapette.append(selected_card)
         remove_card_from_source(piles, selected_from, selected_index)
-        return True
+        return 'crapette', 1 if opponent_crapette is piles['player2']['crapette'] else 0
     return False
 
 def try_place_on_opponent_waste(selected_card, selected_from, selected_index, piles):
@@ -59,15 +71,11 @@ def try_place_on_opponent_waste(selected_card, selected_from, selected_index, pi
     if not target_waste:
         return False
 
-    top = target_waste[-1]
-    if (
-        selected_card['color'] != top['color'] and
-        abs(piles['card_value'](selected_card) - piles['card_value'](top)) == 1
-    ):
+    if piles['can_play_on_waste'](selected_card, target_waste[-1]):
         target_waste.append(selected_card)
         remove_card_from_source(piles, selected_from, selected_index)
-        print(f"🔁 Played {selected_card['rank']} on opponent's discard pile")
-        return True
+        LOG.info('play_on_waste', card=selected_card)
+        return 'waste', 1 if current_turn == "Player 1" else 0
 
     return False
 
@@ -77,6 +85,14 @@ def remove_card_from_source(piles, source, index):
         piles['player1']['crapette'].pop()
     elif source == 'waste':
         piles['player1']['waste'].pop()
+    elif source == 'p2_crapette':
+        piles['player2']['crapette'].pop()
+    elif source == 'p2_waste':
+        piles['player2']['waste'].pop()
+    elif source == 'revealed':
+        # The turned talon card belongs to whoever is playing
+        player = piles['player1'] if piles['current_turn'] == "Player 1" else piles['player2']
+        player.pop('revealed', None)
     elif source == 'tableau_left':
         piles['tableau_left'][index].pop()
     elif source == 'tableau_right':
@@ -88,12 +104,12 @@ def try_draw_from_talon(mouse_pos, current_turn, player1, player2, card_width, c
         if player1['crapette']:
             top_crapette = player1['crapette'][-1]
             if can_play_anywhere(top_crapette, player1, player2, foundation_left, foundation_right, tableau_left, tableau_right):
-                print("❌ Player 1 must use crapette card before talon.")
+                LOG.warn('talon_blocked', reason="Player 1 must use crapette card before talon.")
                 return False
         if player1['talon']:
             card = player1['talon'].pop()
             player1['waste'].append(card)
-            print(f"🃏 Player 1 drew {card['rank']} of {card['suit_name']}")
+            LOG.info('draw', player="Player 1", card=card)
             return True
 
     # Player 2 (top)
@@ -101,31 +117,31 @@ def try_draw_from_talon(mouse_pos, current_turn, player1, player2, card_width, c
         if player2['crapette']:
             top_crapette = player2['crapette'][-1]
             if can_play_anywhere(top_crapette, player2, player1, foundation_left, foundation_right, tableau_left, tableau_right):
-                print("❌ Player 2 must use crapette card before talon.")
+                LOG.warn('talon_blocked', reason="Player 2 must use crapette card before talon.")
                 return False
         if player2['talon']:
             card = player2['talon'].pop()
             player2['waste'].append(card)
-            print(f"🃏 Player 2 drew {card['rank']} of {card['suit_name']}")
+            LOG.info('draw', player="Player 2", card=card)
             return True
 
     return False
     
     # Switch turn
     next_turn = "Player 2" if current_turn == "Player 1" else "Player 1"
-    print(f"🔁 Turn changes to {next_turn}")
+    LOG.info('turn', player=next_turn)
     return next_turn
 
 def handle_turn_button_click(mouse_pos, end_turn_btn, current_turn):
     if end_turn_btn.collidepoint(mouse_pos):
         next_turn = "Player 2" if current_turn == "Player 1" else "Player 1"
-        print(f"🔁 Turn changed to {next_turn}")
+        LOG.info('turn', player=next_turn)
         return next_turn
     return current_turn
 
 
 def handle_crapette_button_click(mouse_pos, crapette_btn):
     if crapette_btn.collidepoint(mouse_pos):
-        print("🛑 Crapette claimed! (Check logic here)")
+        LOG.info('crapette_claim')
         return True
     return False
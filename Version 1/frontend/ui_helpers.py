@@ -1,7 +1,10 @@
+import card_rules
+
 RANKS = ['a'] + [str(n) for n in range(2, 11)] + ['j', 'q', 'k']
+RANK_VALUES = {rank: i for i, rank in enumerate(RANKS)}
 
 def card_value(card):
-    return RANKS.index(card['rank'])
+    return RANK_VALUES[card['rank']]
 
 def can_draw_talon(player, opponent, foundation_left, foundation_right, tableau_left, tableau_right):
     return not (
@@ -17,11 +20,7 @@ def can_draw_talon(player, opponent, foundation_left, foundation_right, tableau_
     )
 
 def has_any_valid_move(player, opponent, foundation_left, foundation_right, tableau_left, tableau_right):
-    def is_progressive_move(card, target):
-        return (
-            card['color'] != target['color'] and
-            card_value(card) == card_value(target) - 1
-        )
+    is_progressive_move = can_play_on_tableau
 
     # 1️⃣ Check crapette
     if player['crapette']:
@@ -89,23 +88,12 @@ def has_any_valid_move(player, opponent, foundation_left, foundation_right, tabl
         
     return False
 
-def can_play_on_tableau(card, target):
-    return card_value(card) == card_value(target) - 1 and card['color'] != target['color']
-
-def can_play_on_foundation(card, pile):
-    if not pile:
-        return card['rank'] == 'a'
-    top = pile[-1]
-    return top['suit'] == card['suit'] and card_value(card) == card_value(top) + 1
-
-def can_play_on_crapette(card, target):
-    return card['suit'] == target['suit'] and abs(card_value(card) - card_value(target)) == 1
-
-def can_play_on_opponent_crapette(card, top):
-    return (
-        card['suit'] == top['suit'] and
-        abs(card_value(card) - card_value(top)) == 1
-    )
+# 📐 Table lookups, see card_rules
+can_play_on_tableau = card_rules.can_play_on_tableau
+can_play_on_foundation = card_rules.can_play_on_foundation
+can_play_on_crapette = card_rules.can_play_on_crapette
+can_play_on_opponent_crapette = card_rules.can_play_on_crapette
+can_play_on_opponent_waste = card_rules.can_play_on_waste
 
 def can_play_anywhere(card, player1, player2, foundation_left, foundation_right, tableau_left, tableau_right):
     # Check foundations (left and right)
@@ -1,13 +1,19 @@
-import pygame
+import os
 import random
+import sys
+
+import pygame
 
-# Initialize Pygame
-pygame.init()
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
+
+import card_rules
+from text_cache import render_text, TEXT_CACHE, LazyFont
+from frame_scheduler import FrameScheduler
 
 # Screen settings
 WIDTH, HEIGHT = 1200, 850
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Crapette – Click-to-Move Edition")
+SCREEN = None  # 🚀 created in init_display() when main() starts
 
 # Colors
 WHITE = (255, 255, 255)
@@ -19,7 +25,7 @@ YELLOW = (255, 255, 0)
 BLUE = (70, 130, 180)
 
 # Fonts
-FONT = pygame.font.SysFont("arial", 18)
+FONT = LazyFont(18)  # bundled font, loaded on first render
 
 # Card settings
 CARD_WIDTH, CARD_HEIGHT = 70, 100
@@ -31,7 +37,8 @@ RANKS = ['A'] + [str(n) for n in range(2, 11)] + ['J', 'Q', 'K']
 
 
 def create_deck():
-    return [{'rank': r, 'suit': s, 'color': 'red' if s in ['♥', '♦'] else 'black'} for r in RANKS for s in SUITS]
+    return [{'rank': r, 'suit': s, 'color': 'red' if s in ['♥', '♦'] else 'black', 'face': card_rules.FACE[r + s]}
+            for r in RANKS for s in SUITS]
 
 
 def deal_cards():
@@ -61,20 +68,9 @@ def deal_cards():
     return player1, player2, foundation, tableau
 
 
-def card_value(card):
-    return RANKS.index(card['rank'])
-
-
-def can_play_on_tableau(card, target_card):
-    # Check descending order (target's value must be one higher) and alternating color.
-    return card_value(card) == card_value(target_card) - 1 and card['color'] != target_card['color']
-
-
-def can_play_on_foundation(card, pile):
-    if not pile:
-        return card['rank'] == 'A'
-    top = pile[-1]
-    return top['suit'] == card['suit'] and card_value(card) == card_value(top) + 1
+# 📐 Descending alternating colours on the tableau, suit sequences from the ace on foundations: card_rules tables
+can_play_on_tableau = card_rules.can_play_on_tableau
+can_play_on_foundation = card_rules.can_play_on_foundation
 
 
 def draw_card(x, y, card, selected=False, hidden=False):
@@ -83,8 +79,8 @@ def draw_card(x, y, card, selected=False, hidden=False):
     pygame.draw.rect(SCREEN, color, rect)
     pygame.draw.rect(SCREEN, BLACK, rect, 2)
     if not hidden and 'rank' in card and 'suit' in card:
-        rank_text = FONT.render(card['rank'], True, RED if card['color'] == 'red' else BLACK)
-        suit_text = FONT.render(card['suit'], True, RED if card['color'] == 'red' else BLACK)
+        rank_text = render_text(FONT, card['rank'], True, RED if card['color'] == 'red' else BLACK)
+        suit_text = render_text(FONT, card['suit'], True, RED if card['color'] == 'red' else BLACK)
         SCREEN.blit(rank_text, (x + 10, y + 10))
         SCREEN.blit(suit_text, (x + 10, y + 40))
     return rect
@@ -94,18 +90,28 @@ def draw_slot(x, y, label=""):
     rect = pygame.Rect(x, y, CARD_WIDTH, CARD_HEIGHT)
     pygame.draw.rect(SCREEN, GRAY, rect, 2)
     if label:
-        label_text = FONT.render(label, True, WHITE)
+        label_text = render_text(FONT, label, True, WHITE)
         SCREEN.blit(label_text, (x, y - 20))
     return rect
 
 
 def draw_label(text, x, y):
-    label = FONT.render(text, True, WHITE)
+    label = render_text(FONT, text, True, WHITE)
     SCREEN.blit(label, (x, y))
 
 
+def init_display():
+    global SCREEN
+    if SCREEN is None:
+        pygame.display.init()
+        SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Crapette – Click-to-Move Edition")
+    return SCREEN
+
+
 def main():
-    clock = pygame.time.Clock()
+    init_display()
+    scheduler = FrameScheduler(60)  # 💤 sleeps in event.wait() between clicks
     running = True
 
     player1, player2, foundation, tableau = deal_cards()
@@ -208,7 +214,7 @@ def main():
         draw_label("Talon", x_talon_p1, bot_y - 20)
 
         # --- Event Handling (Click-to-select then click-to-move) ---
-        for event in pygame.event.get():
+        for event in scheduler.events():
             if event.type == pygame.QUIT:
                 running = False
 
@@ -287,8 +293,10 @@ def main():
                         selected_from = None
 
         pygame.display.flip()
-        clock.tick(60)
+        scheduler.wait()
 
+    print(f"💤 Scheduler: {scheduler.stats()}")
+    print(f"🔤 Text cache: {TEXT_CACHE.stats()}")
     pygame.quit()
 
 
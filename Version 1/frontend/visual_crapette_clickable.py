@@ -1,13 +1,19 @@
-import pygame
+import os
 import random
+import sys
+
+import pygame
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared'))
 
-# Initialize Pygame
-pygame.init()
+import card_rules
+from text_cache import render_text, TEXT_CACHE, LazyFont
+from frame_scheduler import FrameScheduler
 
 # Screen settings
 WIDTH, HEIGHT = 1200, 800
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Crapette – Play to Center Piles")
+SCREEN = None  # 🚀 created in init_display() when main() starts
 
 # Colors
 WHITE = (255, 255, 255)
@@ -18,7 +24,7 @@ GRAY = (180, 180, 180)
 YELLOW = (255, 255, 0)
 
 # Fonts
-FONT = pygame.font.SysFont("arial", 20)
+FONT = LazyFont(20)  # bundled font, loaded on first render
 
 # Card settings
 CARD_WIDTH, CARD_HEIGHT = 70, 100
@@ -29,7 +35,8 @@ SUITS = ['♠', '♥', '♦', '♣']
 RANKS = ['A'] + [str(n) for n in range(2, 11)] + ['J', 'Q', 'K']
 
 def create_deck():
-    return [{'rank': r, 'suit': s, 'color': 'red' if s in ['♥', '♦'] else 'black'} for r in RANKS for s in SUITS]
+    return [{'rank': r, 'suit': s, 'color': 'red' if s in ['♥', '♦'] else 'black', 'face': card_rules.FACE[r + s]}
+            for r in RANKS for s in SUITS]
 
 def deal_cards():
     deck1 = create_deck()
@@ -62,8 +69,8 @@ def draw_card(x, y, card, selected=False):
     pygame.draw.rect(SCREEN, YELLOW if selected else WHITE, rect)
     pygame.draw.rect(SCREEN, BLACK, rect, 2)
 
-    rank_text = FONT.render(card['rank'], True, RED if card['color'] == 'red' else BLACK)
-    suit_text = FONT.render(card['suit'], True, RED if card['color'] == 'red' else BLACK)
+    rank_text = render_text(FONT, card['rank'], True, RED if card['color'] == 'red' else BLACK)
+    suit_text = render_text(FONT, card['suit'], True, RED if card['color'] == 'red' else BLACK)
     SCREEN.blit(rank_text, (x + 10, y + 10))
     SCREEN.blit(suit_text, (x + 10, y + 40))
 
@@ -74,17 +81,19 @@ def draw_slot(x, y):
     pygame.draw.rect(SCREEN, GRAY, rect, 2)
     return rect
 
-def card_value(card):
-    return RANKS.index(card['rank'])
+can_play_on_center = card_rules.can_play_on_foundation  # 📐 same rule as a foundation
 
-def can_play_on_center(card, pile):
-    if not pile:
-        return card['rank'] == 'A'
-    top = pile[-1]
-    return top['suit'] == card['suit'] and card_value(card) == card_value(top) + 1
+def init_display():
+    global SCREEN
+    if SCREEN is None:
+        pygame.display.init()
+        SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Crapette – Play to Center Piles")
+    return SCREEN
 
 def main():
-    clock = pygame.time.Clock()
+    init_display()
+    scheduler = FrameScheduler(60)  # 💤 sleeps in event.wait() between clicks
     running = True
 
     player1, player2, center_piles = deal_cards()
@@ -141,7 +150,7 @@ def main():
             y = 40
             draw_card(x, y, player2['crapette'][-1])
 
-        for event in pygame.event.get():
+        for event in scheduler.events():
             if event.type == pygame.QUIT:
                 running = False
 
@@ -175,8 +184,10 @@ def main():
                                 print("❌ Invalid move.")
 
         pygame.display.flip()
-        clock.tick(60)
+        scheduler.wait()
 
+    print(f"💤 Scheduler: {scheduler.stats()}")
+    print(f"🔤 Text cache: {TEXT_CACHE.stats()}")
     pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+# 📐 Placement rules as precomputed lookup tables, shared by the backend and
+# every frontend. A card's owner never changes what it can go on, so the
+# tables are per face: 52 × 53 bytes each, the extra column standing for an
+# empty pile. Legality is then one bytes lookup instead of rank.index() calls.
+# Card dicts carry their 'face' (deck.create_deck, compact_state.decode_card),
+# backend Cards a .face attribute.
+
+RANKS = ['a'] + [str(n) for n in range(2, 11)] + ['j', 'q', 'k']
+SUITS = ['♠', '♥', '♦', '♣']
+RED_SUITS = {'♥', '♦'}
+
+FACES = [(rank, suit) for suit in SUITS for rank in RANKS]  # face = suit * 13 + rank
+EMPTY = len(FACES)
+STRIDE = EMPTY + 1
+
+# 'a♠' and 'A♠' alike: the pygame frontends use lowercase ranks, visual_crapette and the backend uppercase
+FACE = {}
+for face, (rank, suit) in enumerate(FACES):
+    FACE[rank + suit] = FACE[rank.upper() + suit] = face
+
+
+def _table(rule, on_empty):
+    cells = bytearray(EMPTY * STRIDE)
+    for c, (rank, suit) in enumerate(FACES):
+        card = (RANKS.index(rank), suit, suit in RED_SUITS)
+        for t, (target_rank, target_suit) in enumerate(FACES):
+            cells[c * STRIDE + t] = rule(card, (RANKS.index(target_rank), target_suit, target_suit in RED_SUITS))
+        cells[c * STRIDE + EMPTY] = on_empty(card)
+    return bytes(cells)
+
+
+# Foundation: same suit, one rank up; aces start an empty pile
+FOUNDATION = _table(lambda c, t: c[1] == t[1] and c[0] == t[0] + 1, lambda c: c[0] == 0)
+# Tableau: one rank down, alternating colour; anything goes on an empty pile
+TABLEAU = _table(lambda c, t: c[2] != t[2] and c[0] == t[0] - 1, lambda c: True)
+# Opponent's crapette: same suit, one rank up or down
+CRAPETTE = _table(lambda c, t: c[1] == t[1] and abs(c[0] - t[0]) == 1, lambda c: False)
+# Opponent's waste: alternating colour, one rank up or down
+WASTE = _table(lambda c, t: c[2] != t[2] and abs(c[0] - t[0]) == 1, lambda c: False)
+
+
+def face_of(card):
+    return FACE[card['rank'] + card['suit']]
+
+
+def can_play_on_foundation(card, pile):
+    return FOUNDATION[card['face'] * STRIDE + (pile[-1]['face'] if pile else EMPTY)] == 1
+
+
+def can_play_on_tableau(card, target):
+    return TABLEAU[card['face'] * STRIDE + target['face']] == 1
+
+
+def can_play_on_crapette(card, target):
+    return CRAPETTE[card['face'] * STRIDE + target['face']] == 1
+
+
+def can_play_on_waste(card, target):
+    return WASTE[card['face'] * STRIDE + target['face']] == 1
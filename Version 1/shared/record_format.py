@@ -0,0 +1,160 @@
+import os
+import sys
+from array import array
+
+# 📼 Binary game records. Everything is a stream of little-endian uint16 words:
+#
+#   file header   b'CRAPREC' + version byte                      (4 words)
+#   game start    0xFFFE, seed (4 words), variant | flags << 8,
+#                 max_turns, max_moves_per_turn                  (8 words)
+#   moves         one word each, always < 0xFFF0
+#   game end      0xFFFF, winner + 1 (0 = none), turns           (3 words)
+#
+# A file holds any number of games back to back, so millions of bot games
+# append to one archive at ~2 bytes per move plus 22 bytes per game.
+# Only the container lives here, shared by the backend and the frontend;
+# replaying a game is up to its variant (frontend/game_record.py for Board
+# games, backend Game.replay for backend games).
+MAGIC = b'CRAPREC'
+FORMAT_VERSION = 1
+GAME_START = 0xFFFE
+GAME_END = 0xFFFF
+
+# Rules variants: what a move word means and how to replay it
+VARIANT_BOARD = 0     # CrapetteEngine / centerplay: compact_state.Board ops (src << 5 | dst, TURN_OP)
+VARIANT_BACKEND = 1   # backend.Game: card plays to the 8 center piles, draw, skip
+FLAG_RECYCLE_WASTE = 1
+
+CHUNK_WORDS = 1 << 15
+
+def _words(values):
+    words = array('H', values)
+    if sys.byteorder == 'big':
+        words.byteswap()
+    return words.tobytes()
+
+
+class RecordWriter:
+    """
+    Appends games move by move: begin_game(), write() per move, end_game().
+    Nothing is held back beyond the file object's own buffer, so a crashed
+    run still leaves every finished game readable. header=False writes bare
+    games, for buffers that get appended to an existing record later.
+    """
+
+    def __init__(self, target, header=True):
+        if isinstance(target, (str, os.PathLike)):
+            self.file = open(target, 'ab')
+            self.owns_file = True
+        else:
+            self.file = target
+            self.owns_file = False
+        if header and self.file.tell() == 0:
+            self.file.write(MAGIC + bytes([FORMAT_VERSION]))
+        self.moves = 0
+        self.games = 0
+        self.in_game = False
+
+    def begin_game(self, seed, variant=VARIANT_BOARD, flags=0, max_turns=0, max_moves_per_turn=0):
+        if self.in_game:
+            raise ValueError("previous game was not ended")
+        seed &= (1 << 64) - 1
+        self.file.write(_words([GAME_START, seed & 0xFFFF, (seed >> 16) & 0xFFFF, (seed >> 32) & 0xFFFF, seed >> 48,
+                                variant | flags << 8, max_turns, max_moves_per_turn]))
+        self.in_game = True
+
+    def write(self, move):
+        self.file.write(_words((move,)))
+        self.moves += 1
+
+    def write_many(self, moves):
+        self.file.write(_words(moves))
+        self.moves += len(moves)
+
+    def end_game(self, winner=None, turns=0):
+        self.file.write(_words([GAME_END, 0 if winner is None else winner + 1, min(turns, 0xFFFF)]))
+        self.in_game = False
+        self.games += 1
+
+    def close(self):
+        if self.owns_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class RecordedGame:
+    """One game from read_games(); moves is a lazy iterator, winner/turns are set once it is used up."""
+
+    def __init__(self, seed, variant, flags, max_turns, max_moves_per_turn, moves):
+        self.seed = seed
+        self.variant = variant
+        self.flags = flags
+        self.max_turns = max_turns
+        self.max_moves_per_turn = max_moves_per_turn
+        self.moves = moves
+        self.winner = None
+        self.turns = 0
+        self.finished = False
+
+    @property
+    def rules(self):
+        """CrapetteEngine keyword arguments for this game."""
+        return {'max_turns': self.max_turns, 'max_moves_per_turn': self.max_moves_per_turn,
+                'recycle_waste': bool(self.flags & FLAG_RECYCLE_WASTE)}
+
+
+def read_words(f):
+    header = f.read(len(MAGIC) + 1)
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a Crapette game record")
+    if header[len(MAGIC)] > FORMAT_VERSION:
+        raise ValueError(f"game record version {header[len(MAGIC)]} is newer than this reader ({FORMAT_VERSION})")
+    while True:
+        chunk = f.read(2 * CHUNK_WORDS)
+        if not chunk:
+            return
+        words = array('H')
+        words.frombytes(chunk[:len(chunk) & ~1])
+        if sys.byteorder == 'big':
+            words.byteswap()
+        yield from words
+
+
+def read_games(source):
+    """
+    Stream games from a path or binary file. Each RecordedGame's moves are
+    read lazily; moving on to the next game skips whatever was left unread.
+    """
+    f = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    try:
+        words = read_words(f)
+        for word in words:
+            if word != GAME_START:
+                raise ValueError(f"expected a game start, found {word:#06x}")
+            s0, s1, s2, s3, kind, max_turns, max_moves = (next(words) for _ in range(7))
+            game = RecordedGame(s0 | s1 << 16 | s2 << 32 | s3 << 48, kind & 0xFF, kind >> 8, max_turns, max_moves, None)
+
+            def moves(game=game):
+                for move in words:
+                    if move == GAME_END:
+                        winner = next(words)
+                        game.winner = winner - 1 if winner else None
+                        game.turns = next(words)
+                        game.finished = True
+                        return
+                    yield move
+                raise ValueError("game record ends in the middle of a game")
+
+            game.moves = moves()
+            yield game
+            for _ in game.moves:
+                pass
+    finally:
+        if f is not source:
+            f.close()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import the modules by name, the way the scripts do
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path[:0] = [os.path.join(ROOT, 'shared'), os.path.join(ROOT, 'frontend'), os.path.join(ROOT, 'backend')]
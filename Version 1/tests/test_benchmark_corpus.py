@@ -0,0 +1,18 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+
+from make_corpus import CORPUS, record, load_position, dump_position
+
+
+def test_corpus_is_what_make_corpus_records():
+    with open(CORPUS) as f:
+        assert f.read().splitlines() == record()
+
+
+def test_positions_load_back():
+    with open(CORPUS) as f:
+        lines = f.read().splitlines()
+    for line in lines[::25]:
+        assert dump_position(load_position(line)) == line
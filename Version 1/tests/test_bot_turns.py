@@ -0,0 +1,42 @@
+import random
+
+from bot_player import BotPlayer, paced_random_policy, take_card, ui_pile
+from compact_state import Board
+from crapette_engine import CrapetteEngine, DRAW_TALON, END_TURN
+from deck import deal_cards
+from move_gen import PLAYER_INDEX
+from visual_crapette_centerplay import finalize_turn
+
+
+def play_like_ui(state, player, action, current_turn):
+    """What centerplay's bot branch does with a decided action, the card flight landing at once."""
+    if action == END_TURN:
+        return finalize_turn(player, current_turn)
+    if action == DRAW_TALON:
+        player['revealed'] = player['talon'].pop()
+    else:
+        card = take_card(state, action >> 5)
+        ui_pile(state, action & 31).append(card)
+    return current_turn
+
+
+def test_bot_turns_keep_ui_and_engine_in_step():
+    state = deal_cards(random.Random(5))
+    current_turn = "Player 1"
+    engine = CrapetteEngine.from_deal(state, current_turn, check_cards=True)
+    bot = BotPlayer('random', think_time=0)
+    bot.policy = paced_random_policy(0, random.Random(6))
+    draws = 0
+
+    for _ in range(40):
+        if engine.over:
+            break
+        bot.play_turn(Board.from_piles(*state, current_turn))
+        while not bot.moves.empty():
+            action, _ = bot.moves.get()
+            draws += action == DRAW_TALON
+            engine.apply(action)
+            current_turn = play_like_ui(state, state[PLAYER_INDEX[current_turn]], action, current_turn)
+        assert Board.from_piles(*state, current_turn) == engine.board
+        assert not any(player.get('revealed') for player in state[:2])
+    assert draws
@@ -0,0 +1,58 @@
+import random
+
+from compact_state import Board
+from crapette_engine import CrapetteEngine, deal_board, random_policy
+
+
+def snapshot(board):
+    return [bytes(pile) for pile in board.piles], bytes(board.revealed), board.turn, board.hash
+
+
+def test_hash_matches_rehash_after_every_move():
+    rng = random.Random(1)
+    for game in range(5):
+        engine = CrapetteEngine.new_game(rng, check_cards=False)
+        policy = random_policy(random.Random(game))
+        board = engine.board
+        while not engine.over:
+            engine.apply(policy(engine, engine.legal_actions()))
+            assert board.hash == board.copy().rehash()
+
+
+def test_undo_and_rollback_restore_the_position():
+    rng = random.Random(2)
+    engine = CrapetteEngine.new_game(rng, check_cards=False)
+    policy = random_policy(random.Random(3))
+    board = engine.board
+    start = snapshot(board)
+    start_mark = board.mark()
+    seen = []
+    while not engine.over and len(seen) < 400:
+        seen.append(snapshot(board))
+        engine.apply(policy(engine, engine.legal_actions()))
+
+    # 🔙 One apply at a time, every intermediate position comes back exactly
+    for expected in reversed(seen[len(seen) // 2:]):
+        engine.undo()
+        assert snapshot(board) == expected
+
+    board.rollback(start_mark)
+    assert snapshot(board) == start
+    assert board.history == []
+
+
+def test_same_position_same_hash_whatever_the_path():
+    board = deal_board(random.Random(4))
+    other = board.copy()
+    assert other == board and hash(other) == hash(board)
+    # Out and back again: same position, same hash, though the undo logs differ
+    board.switch_turn()
+    board.switch_turn()
+    assert board.hash == other.hash and board == other
+
+
+def test_from_piles_round_trip():
+    board = deal_board(random.Random(5))
+    again = Board.from_piles(*board.to_piles(), current_turn=board.current_turn)
+    assert again == board
+    assert again.hash == board.hash
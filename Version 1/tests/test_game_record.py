@@ -0,0 +1,85 @@
+import io
+import random
+
+import pytest
+
+from crapette_engine import CrapetteEngine, random_policy
+from game_record import play_recorded, replay_board
+from record_format import RecordWriter, read_games, MAGIC, VARIANT_BOARD, VARIANT_BACKEND
+
+
+def policies():
+    return [random_policy(random.Random(1)), random_policy(random.Random(2))]
+
+
+def test_write_read_replay_board_games(tmp_path):
+    path = tmp_path / 'games.crec'
+    finals = {}
+    with RecordWriter(str(path)) as writer:
+        for seed in range(8):
+            result = play_recorded(writer, seed, policies())
+            engine = CrapetteEngine.new_game(random.Random(seed))
+            engine.play(policies())
+            finals[seed] = (engine.board, result)
+
+    assert path.read_bytes().startswith(MAGIC)
+    games = 0
+    for game in read_games(str(path)):
+        board, result = finals[game.seed]
+        assert game.variant == VARIANT_BOARD
+        assert replay_board(game) == board
+        assert game.finished
+        assert game.winner == result['winner'] and game.turns == result['turns']
+        games += 1
+    assert games == len(finals)
+
+
+def test_skipping_unread_moves_keeps_games_in_step():
+    buffer = io.BytesIO()
+    writer = RecordWriter(buffer)
+    for seed in range(4):
+        writer.begin_game(seed, VARIANT_BOARD)
+        writer.write_many(range(seed * 10))
+        writer.end_game(seed % 2, seed)
+    buffer.seek(0)
+    # Only every other game's moves get read
+    seeds = []
+    for n, game in enumerate(read_games(buffer)):
+        seeds.append(game.seed)
+        if n % 2:
+            assert list(game.moves) == list(range(game.seed * 10))
+            assert game.winner == game.seed % 2
+    assert seeds == [0, 1, 2, 3]
+
+
+def test_truncated_record_is_an_error():
+    buffer = io.BytesIO()
+    writer = RecordWriter(buffer)
+    writer.begin_game(7, VARIANT_BOARD)
+    writer.write_many([1, 2, 3])
+    buffer.seek(0)
+    game = next(read_games(buffer))
+    with pytest.raises(ValueError):
+        list(game.moves)
+
+
+def test_not_a_record():
+    with pytest.raises(ValueError):
+        next(read_games(io.BytesIO(b'something else entirely')))
+
+
+def test_backend_games_replay(tmp_path):
+    from batch_runner import greedy_policy, play_one
+    from game import Game
+
+    path = tmp_path / 'backend.crec'
+    with RecordWriter(str(path)) as writer:
+        for seed in range(5):
+            play_one(seed, greedy_policy, 500, writer)
+    for game in read_games(str(path)):
+        assert game.variant == VARIANT_BACKEND
+        replayed = Game.replay(game.seed, list(game.moves))
+        played = Game(game.seed)
+        played.run(greedy_policy, 500)
+        assert replayed.center.piles == played.center.piles
+        assert [p.talon for p in replayed.players] == [p.talon for p in played.players]
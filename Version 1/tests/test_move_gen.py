@@ -0,0 +1,9 @@
+import pytest
+
+from check_move_gen import run
+
+
+@pytest.mark.parametrize('use_sync', [False, True])
+def test_move_gen_matches_rescans(use_sync):
+    # has_any_valid_move, crapette_playable and suggest_move against ui_helpers, both players, every step
+    assert run(games=12, steps=100, seed=7, use_sync=use_sync) == 2400
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from compact_state import NO_CARD
+from position_corpus import PositionCorpus, INDEX_KEYS, record_self_play
+
+
+@pytest.fixture(scope='module')
+def corpus(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('corpus') / 'positions.crpos')
+    record_self_play(path, games=6, every=3, seed=11)
+    corpus = PositionCorpus(path)
+    corpus.build_indexes()
+    return corpus
+
+
+def scan(corpus, name, low, high):
+    keys = np.concatenate([INDEX_KEYS[name](records) for _, records in corpus.chunks(chunk=97)])
+    return np.flatnonzero((keys >= low) & (keys < high))
+
+
+@pytest.mark.parametrize('name', sorted(INDEX_KEYS))
+def test_index_matches_scan(corpus, name):
+    top = int(max(INDEX_KEYS[name](corpus.records))) + 2
+    for low, high in ((0, 1), (0, 5), (3, 9), (top - 3, top), (top, top + 4)):
+        assert np.array_equal(np.sort(corpus.lookup(name, low, high)), scan(corpus, name, low, high))
+
+
+def test_index_lists_records_in_file_order(corpus):
+    found = corpus.with_count('p1_crapette', 0, 20)
+    order, offsets = corpus.index('p1_crapette')
+    for key in range(len(offsets) - 1):
+        block = np.asarray(order[offsets[key]:offsets[key + 1]])
+        assert np.all(np.diff(block.astype(np.int64)) > 0)
+    assert len(found) == len(scan(corpus, 'p1_crapette', 0, 20))
+
+
+def test_reopened_corpus_reuses_indexes(corpus):
+    again = PositionCorpus(corpus.path)
+    assert np.array_equal(again.at_move(0, 30), corpus.at_move(0, 30))
+
+
+def test_where_and_unpack(corpus):
+    revealed = corpus.where(lambda r: r['revealed'][:, 0] != NO_CARD, chunk=50)
+    assert np.array_equal(revealed, np.flatnonzero(corpus.records['revealed'][:, 0] != NO_CARD))
+    for i in (0, len(corpus) // 2, len(corpus) - 1):
+        board = corpus.board(i)
+        assert board.hash == board.copy().rehash() == int(corpus[i]['hash'])